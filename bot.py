@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord.ext import commands
 import os
@@ -9,8 +10,8 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 import config
-from utils.db_utils import load_data
-from utils.log_utils import setup_discord_logging
+from utils.db_utils import load_data, run_save_flusher, flush_pending_save
+from utils.discord_logging import setup_discord_logging
 
 # --- Setup ---
 load_dotenv()
@@ -67,6 +68,9 @@ class AliceBot(commands.Bot):
         """This is called once when the bot logs in."""
         logger.info("--- Running Setup Hook ---")
 
+        # 0. Start the background writer that coalesces debounced data saves
+        self._save_flusher = asyncio.create_task(run_save_flusher())
+
         # 1. Load all cogs
         logger.info("--- Loading Cogs ---")
         for extension in self.initial_extensions:
@@ -87,6 +91,11 @@ class AliceBot(commands.Bot):
             await self.tree.sync()
             logger.info("Commands synced globally.")
 
+    async def close(self):
+        """Write any debounced save still pending before shutting down."""
+        flush_pending_save()
+        await super().close()
+
     async def on_ready(self):
         """Called when the bot is ready and online."""
         logger.info(f'--- Logged in as {self.user} (ID: {self.user.id}) ---')
@@ -5,10 +5,10 @@ import logging
 from typing import Optional
 
 from utils.db_utils import (
-    save_data, sync_from_fs, backup_data, resolve_puzzle_key,
+    save_data_async, sync_from_fs, backup_data, resolve_puzzle_key,
     get_puzzle_display_name, add_piece_to_user, remove_piece_from_user,
     wipe_puzzle_from_all)
-from utils.log_utils import log
+from utils.discord_logging import send_log
 
 logger = logging.getLogger(__name__)
 
@@ -69,9 +69,9 @@ class AdminCog(commands.Cog, name="Owner"):
         staff_list = self.bot.data.setdefault("staff", [])
         if str(user.id) not in staff_list:
             staff_list.append(str(user.id))
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
             await ctx.send(f"✅ {user.mention} has been added to the staff list.", ephemeral=False)
-            await log(self.bot, f"🔑 {user.mention} was added to staff by {ctx.author.mention}.")
+            await send_log(self.bot, f"🔑 {user.mention} was added to staff by {ctx.author.mention}.")
         else:
             await ctx.send(f"⚠️ {user.mention} is already on the staff list.", ephemeral=False)
 
@@ -82,9 +82,9 @@ class AdminCog(commands.Cog, name="Owner"):
         staff_list = self.bot.data.get("staff", [])
         if str(user.id) in staff_list:
             staff_list.remove(str(user.id))
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
             await ctx.send(f"✅ {user.mention} has been removed from the staff list.", ephemeral=False)
-            await log(self.bot, f"🔑 {user.mention} was removed from staff by {ctx.author.mention}.")
+            await send_log(self.bot, f"🔑 {user.mention} was removed from staff by {ctx.author.mention}.")
         else:
             await ctx.send(f"⚠️ {user.mention} is not on the staff list.", ephemeral=False)
 
@@ -96,11 +96,11 @@ class AdminCog(commands.Cog, name="Owner"):
         backup_data()
         # The bot's current data is passed to the function, which returns the updated version.
         self.bot.data = sync_from_fs(self.bot.data)
-        save_data(self.bot.data)
+        await save_data_async(self.bot.data)
         await ctx.send(
             f"✅ Synced **{len(self.bot.data['puzzles'])}** puzzles and **{sum(len(p) for p in self.bot.data['pieces'].values())}** pieces from the filesystem.",
             ephemeral=False)
-        await log(self.bot, f"🔄 Puzzles synced from filesystem by {ctx.author.mention}.")
+        await send_log(self.bot, f"🔄 Puzzles synced from filesystem by {ctx.author.mention}.")
 
     @commands.hybrid_command(name="givepiece", description="[Owner] Gives a puzzle piece to a user.")
     @app_commands.autocomplete(puzzle_name=puzzle_autocomplete)
@@ -113,11 +113,11 @@ class AdminCog(commands.Cog, name="Owner"):
             return await ctx.send(f"❌ Puzzle not found: `{puzzle_name}`", ephemeral=False)
 
         if add_piece_to_user(self.bot.data, user.id, puzzle_key, piece_id):
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
             display_name = get_puzzle_display_name(self.bot.data, puzzle_key)
             await ctx.send(f"✅ Gave piece `{piece_id}` of **{display_name}** to {user.mention}.", ephemeral=False)
-            await log(self.bot,
-                      f"🎁 Piece `{piece_id}` of **{display_name}** given to {user.mention} by {ctx.author.mention}.")
+            await send_log(self.bot,
+                           f"🎁 Piece `{piece_id}` of **{display_name}** given to {user.mention} by {ctx.author.mention}.")
         else:
             await ctx.send(f"⚠️ {user.mention} already has that piece.", ephemeral=False)
 
@@ -132,11 +132,11 @@ class AdminCog(commands.Cog, name="Owner"):
             return await ctx.send(f"❌ Puzzle not found: `{puzzle_name}`", ephemeral=False)
 
         if remove_piece_from_user(self.bot.data, user.id, puzzle_key, piece_id):
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
             display_name = get_puzzle_display_name(self.bot.data, puzzle_key)
             await ctx.send(f"✅ Took piece `{piece_id}` of **{display_name}** from {user.mention}.", ephemeral=False)
-            await log(self.bot,
-                      f"💔 Piece `{piece_id}` of **{display_name}** taken from {user.mention} by {ctx.author.mention}.")
+            await send_log(self.bot,
+                           f"💔 Piece `{piece_id}` of **{display_name}** taken from {user.mention} by {ctx.author.mention}.")
         else:
             await ctx.send(f"⚠️ {user.mention} does not have that piece.", ephemeral=False)
 
@@ -151,12 +151,12 @@ class AdminCog(commands.Cog, name="Owner"):
             return await ctx.send(f"❌ Puzzle not found: `{puzzle_name}`", ephemeral=False)
 
         wiped_count = wipe_puzzle_from_all(self.bot.data, puzzle_key)
-        save_data(self.bot.data)
+        await save_data_async(self.bot.data)
         display_name = get_puzzle_display_name(self.bot.data, puzzle_key)
         await ctx.send(
             f"✅ Wiped all progress for **{display_name}**. Removed data from **{wiped_count}** users.",
             ephemeral=False)
-        await log(self.bot, f"💥 All progress for **{display_name}** was wiped by {ctx.author.mention}.")
+        await send_log(self.bot, f"💥 All progress for **{display_name}** was wiped by {ctx.author.mention}.")
 
 
 async def setup(bot: commands.Bot):
@@ -10,14 +10,15 @@ from PIL import Image
 
 import config
 from utils.db_utils import (
-    save_data,
+    save_data_async,
+    mark_dirty,
     resolve_puzzle_key,
     get_puzzle_display_name,
 )
-from utils.log_utils import log
+from utils.discord_logging import send_log
 from ui.views import DropView
 from utils.checks import is_admin
-from utils.theme import THEMES, PUZZLE_CONFIG, Emojis, Colors  # Make sure Emojis and Colors are imported
+from utils.theme import PUZZLE_CONFIG, PUZZLE_TO_THEME, Emojis, Colors  # Make sure Emojis and Colors are imported
 
 logger = logging.getLogger(__name__)
 
@@ -125,8 +126,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
     ):
         # Pull config and theme info
         meta = PUZZLE_CONFIG.get(puzzle_key, {})
-        theme_name = meta.get("theme")
-        theme = THEMES.get(theme_name) if theme_name else None
+        theme = PUZZLE_TO_THEME.get(puzzle_key)
 
         display_name = meta.get("display_name", get_puzzle_display_name(self.bot.data, puzzle_key))
         pieces_map = self.bot.data.get("pieces", {}).get(puzzle_key)
@@ -287,7 +287,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
                 continue
 
         if data_changed:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -313,7 +313,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
             if not last_drop_str:
                 raw_cfg["last_drop_time"] = now.isoformat()
                 # don't spawn on the first message
-                save_data(self.bot.data)
+                mark_dirty(self.bot.data)
                 return
 
             last_drop_time = datetime.fromisoformat(last_drop_str)
@@ -341,7 +341,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
                     raw_cfg["next_trigger_time"] = random.randint(min_secs, max_secs)
                     raw_cfg["next_trigger_messages"] = random.randint(min_msgs, max_msgs)
                     raw_cfg["message_count"] = 0
-                    save_data(self.bot.data)
+                    mark_dirty(self.bot.data)
                     await self._spawn_drop(message.channel, puzzle_key)
             return
 
@@ -361,7 +361,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
                 if puzzle_key:
                     await self._spawn_drop(message.channel, puzzle_key)
                     raw_cfg["message_count"] = 0
-                save_data(self.bot.data)
+                mark_dirty(self.bot.data)
 
     @commands.hybrid_command(
         name="spawndrop",
@@ -409,7 +409,7 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
     @is_admin()
     async def pingset_drops(self, ctx: commands.Context, role: discord.Role):
         self.bot.data["piece_drop_ping_role_id"] = role.id
-        save_data(self.bot.data)
+        await save_data_async(self.bot.data)
         await ctx.send(f"🛎️ Drop ping role has been set to {role.mention}. Future drops will ping this role.", ephemeral=False)
 
     @commands.hybrid_command(
@@ -502,13 +502,13 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
         else:
             return await ctx.send("❌ Invalid mode. Use 'timer', 'messages', or 'random'.", ephemeral=True)
 
-        save_data(self.bot.data)
+        await save_data_async(self.bot.data)
         await ctx.send(
             f"✅ Drops for **{display_name}** configured in {channel.mention}.\n"
             f"Mode: `{final_mode}` | Trigger: `{summary}`.",
             ephemeral=False
         )
-        await log(
+        await send_log(
             self.bot,
             f"🔧 Drop channel configured for **{display_name}** in `#{channel.name}` by `{ctx.author}`.")
 
@@ -518,9 +518,9 @@ class PuzzleDropsCog(commands.Cog, name="Puzzle Drops"):
         drop_channels = self.bot.data.get("drop_channels", {})
         if str(channel.id) in drop_channels:
             drop_channels.pop(str(channel.id))
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
             await ctx.send(f"❌ Drop channel removed: {channel.mention}", ephemeral=False)
-            await log(
+            await send_log(
                 self.bot,
                 f"🔧 Drop channel removed for `#{channel.name}` by `{ctx.author}`."
             )
@@ -13,7 +13,7 @@ from utils.db_utils import (
     add_piece_to_user,
     resolve_puzzle_key,
     get_puzzle_display_name,
-    save_data,
+    save_data_async,
     get_user_pieces,
 )
 from ui.views import PuzzleGalleryView, open_leaderboard_view, LeaderboardView
@@ -292,7 +292,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
         if changed:
             self.bot.data["hidden_puzzles"] = list(hidden)
             try:
-                save_data(self.bot.data)
+                await save_data_async(self.bot.data)
             except Exception:
                 logger.exception("puzzle_toggle: failed to persist hidden_puzzles")
             try:
@@ -340,7 +340,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
             return await self._reply(ctx, f"✅ {user} is already privileged to view hidden puzzles.", ephemeral=True)
         self.bot.data["always_show_for"].append(uid)
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("always_show_add: persist failed")
         await self._reply(ctx, f"✅ {user} can now see hidden puzzles.", ephemeral=True)
@@ -354,7 +354,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
             return await self._reply(ctx, f"ℹ️ {user} is not in the always-show list.", ephemeral=True)
         self.bot.data["always_show_for"] = [x for x in current if int(x) != uid]
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("always_show_remove: persist failed")
         await self._reply(ctx, f"✅ {user} no longer has privileged access to hidden puzzles.", ephemeral=True)
@@ -519,7 +519,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
                 logger.exception("Failed to backfill finish record %s[%s]", puzzle_key, idx)
 
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("Failed to persist after finishes_backfill_ts")
 
@@ -620,7 +620,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
 
         self.bot.data["puzzle_finishers"][puzzle_key] = new_finishers
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("remove_finisher: failed to persist puzzle_finishers")
 
@@ -670,7 +670,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
 
         self.bot.data.setdefault("puzzle_finishers", {})[puzzle_key] = []
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("clear_finishers: failed to persist puzzle_finishers")
 
@@ -745,7 +745,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
             self.bot.data["puzzle_finishers"][pkey] = new_list
 
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("remove_user_finishes: failed to persist puzzle_finishers")
 
@@ -792,7 +792,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
             self.bot.data["puzzle_finishers"][pkey] = []
 
         try:
-            save_data(self.bot.data)
+            await save_data_async(self.bot.data)
         except Exception:
             logger.exception("wipe_all_finishers: failed to persist puzzle_finishers")
 
@@ -893,7 +893,7 @@ class PuzzlesCog(commands.Cog, name="Puzzles"):
                 return await self._reply(ctx, f"ℹ️ {member.mention} already has piece `{piece_id}` for puzzle `{puzzle_key}`.", ephemeral=True)
 
             try:
-                save_data(self.bot.data)
+                await save_data_async(self.bot.data)
             except Exception:
                 logger.exception("giveitem: failed to persist data after add_piece_to_user")
 
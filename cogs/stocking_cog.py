@@ -12,6 +12,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils.db_utils import _atomic_write, _json_default
+
 # single logger definition — put this once, near the top
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,16 @@ AUTO_ROLE_ID: Optional[int] = None  # set to your guild role id if desired
 
 _save_lock = asyncio.Lock()
 
+
+def _write_collected_file(data: Dict[str, Any]) -> None:
+    """
+    Fallback writer for COLLECTED_FILE, sharing utils.db_utils' serializer for piece sets and its
+    atomic temp-file swap. Never rewrite COLLECTED_FILE in place; backups may be hardlinks to it.
+    """
+    COLLECTED_FILE.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(data, ensure_ascii=False, indent=2, default=_json_default).encode("utf-8")
+    _atomic_write(COLLECTED_FILE, payload)
+
 # Try to import utcnow from discord.utils, fallback if not present
 try:
     from discord.utils import utcnow  # type: ignore
@@ -214,13 +226,9 @@ class StockingCog(commands.Cog, name="StockingCog"):
                     if loop and loop.is_running():
                         loop.create_task(self._save())
                     else:
-                        COLLECTED_FILE.parent.mkdir(parents=True, exist_ok=True)
-                        with COLLECTED_FILE.open("w", encoding="utf-8") as fh:
-                            json.dump(self._data, fh, ensure_ascii=False, indent=2)
+                        _write_collected_file(self._data)
                 except Exception:
-                    COLLECTED_FILE.parent.mkdir(parents=True, exist_ok=True)
-                    with COLLECTED_FILE.open("w", encoding="utf-8") as fh:
-                        json.dump(self._data, fh, ensure_ascii=False, indent=2)
+                    _write_collected_file(self._data)
         except Exception:
             logger.exception("_load_all: integrity check failed")
 
@@ -241,15 +249,9 @@ class StockingCog(commands.Cog, name="StockingCog"):
                     await loop.run_in_executor(None, lambda: db_utils.save_data(self._data))
                     logger.debug("_save: wrote canonical collected_pieces.json via utils.db_utils.save_data()")
                 except Exception:
-                    collected_path = COLLECTED_FILE
                     loop = asyncio.get_event_loop()
-
-                    def _write_collected():
-                        with open(collected_path, "w", encoding="utf-8") as fh:
-                            json.dump(self._data, fh, ensure_ascii=False, indent=2)
-
-                    await loop.run_in_executor(None, _write_collected)
-                    logger.debug("_save: wrote %s", collected_path)
+                    await loop.run_in_executor(None, lambda: _write_collected_file(self._data))
+                    logger.debug("_save: wrote %s", COLLECTED_FILE)
             except Exception:
                 logger.exception("Unexpected error while saving collected_pieces.json")
 
@@ -404,8 +406,7 @@ class StockingCog(commands.Cog, name="StockingCog"):
                 save_data(botdata)
             except Exception:
                 try:
-                    with COLLECTED_FILE.open("w", encoding="utf-8") as fh:
-                        json.dump(botdata, fh, ensure_ascii=False, indent=2)
+                    _write_collected_file(botdata)
                 except Exception:
                     logger.exception("award_part: failed to persist bot.data fallback file")
         except Exception:
@@ -1,23 +1,35 @@
 # Cog to log command usage to a configured log channel.
 # - Logs when commands are invoked and when they complete
+# - Log lines are queued and posted in batches every few seconds (one message per ~1900 chars)
 # - Attempts to capture the bot's immediate reply (searches for messages by the bot in the channel
-#   that were created after the invocation timestamp, within a short window).
-# - Works for prefix/hybrid commands; provides a fallback on_interaction for pure app commands.
-from typing import Optional, Any
+#   that were created after the invocation timestamp, within a short window). Each logged invocation
+#   registers a Future that on_message resolves with the bot's first reply in that channel, so no
+#   channel.history() API call is needed.
+# - Works for prefix/hybrid commands via the invoke hooks; on_interaction logs pure app commands only,
+#   and an interaction id is only ever logged once.
+from typing import Optional, Dict, List, Tuple
+import asyncio
 import logging
-from datetime import timedelta, datetime, timezone
+import time
+from itertools import chain
+from datetime import timedelta, datetime
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-# Prefer to import send_log from utils.discord_logging; fall back to a local implementation
+import config  # your project config that may contain LOG_CHANNEL_ID, USAGE_* settings
+
+# Prefer to import send_log (and its parsed LOG_CHANNEL_ID) from utils.discord_logging; fall back to a local implementation
 try:
-    from utils.discord_logging import send_log, setup_discord_logging  # type: ignore
+    from utils.discord_logging import send_log, setup_discord_logging, _LOG_CHANNEL_ID  # type: ignore
 except Exception:
     send_log = None  # will use fallback defined below
     setup_discord_logging = None
-
-import config  # your project config that may contain LOG_CHANNEL_ID, USAGE_* settings
+    # LOG_CHANNEL_ID parsed once for the fallback below (None when unset or not numeric)
+    try:
+        _LOG_CHANNEL_ID: Optional[int] = int(config.LOG_CHANNEL_ID) if getattr(config, "LOG_CHANNEL_ID", None) else None
+    except (TypeError, ValueError):
+        _LOG_CHANNEL_ID = None
 
 logger = logging.getLogger(__name__)
 
@@ -25,17 +37,15 @@ logger = logging.getLogger(__name__)
 try:
     from discord.utils import utcnow  # type: ignore
 except Exception:
+    from datetime import timezone
+
     def utcnow() -> datetime:
         return datetime.now(timezone.utc)
 
 # Local fallback send_log if the utils helper isn't available
 async def _fallback_send_log(bot: commands.Bot, message: str, embed: Optional[discord.Embed] = None):
-    try:
-        if not getattr(config, "LOG_CHANNEL_ID", None):
-            logger.debug("LOG_CHANNEL_ID not set; skipping send_log")
-            return
-        cid = int(config.LOG_CHANNEL_ID)
-    except Exception:
+    cid = _LOG_CHANNEL_ID
+    if not cid:
         logger.debug("LOG_CHANNEL_ID invalid or missing; skipping send_log")
         return
     try:
@@ -61,17 +71,85 @@ else:
 
 # Configuration overrides from config.py
 SKIP_ALL_PREFIX = getattr(config, "USAGE_IGNORE_ALL_PREFIX_INVOCATIONS", False)
-SKIP_COMMANDS = set(getattr(config, "USAGE_IGNORED_PREFIX_COMMANDS", ["wordle", "21questions"]))
+SKIP_COMMANDS = frozenset(getattr(config, "USAGE_IGNORED_PREFIX_COMMANDS", ("wordle", "21questions")))
 
 # New: commands for which we only want a minimal acknowledgement in logs (no args, no embed contents).
 # Example defaults include leaderboard/gallery/mysnowman/summary variants.
-QUIET_COMMANDS = set(n.lower() for n in getattr(config, "USAGE_QUIET_COMMANDS",
-                                                  ["leaderboard", "gallery", "mysnowman", "summary21q", "sum21", "sled", "rumble_builds_leaderboard"]))
+QUIET_COMMANDS = frozenset(n.lower() for n in getattr(config, "USAGE_QUIET_COMMANDS",
+                                                        ["leaderboard", "gallery", "mysnowman", "summary21q", "sum21", "sled", "rumble_builds_leaderboard"]))
+
+# Seconds _after_any_command waits for on_message to report the bot's reply before logging without it.
+REPLY_WAIT_SECONDS = getattr(config, "USAGE_REPLY_WAIT_SECONDS", 2.0)
+# Seconds an interaction id is remembered so the same slash invocation is only logged once.
+SEEN_TTL = 10.0
+# Commands that still search channel.history() (within _response_search_window of the invocation) when
+# on_message saw no reply within REPLY_WAIT_SECONDS (e.g. slower replies). Empty by default.
+HISTORY_FALLBACK_COMMANDS = frozenset(n.lower() for n in getattr(config, "USAGE_HISTORY_FALLBACK_COMMANDS", ()))
+
+# Every usage log line has this shape; quiet commands and app-command logs leave args/reply empty.
+_LOG_TEMPLATE = "<@{user_id}> used {cmd}{args} in {chan}{reply}"
+
+# Queued usage log lines are posted every LOG_FLUSH_SECONDS, joined into messages of at most LOG_BATCH_CHARS
+# (under Discord's 2000-character limit).
+LOG_FLUSH_SECONDS = getattr(config, "USAGE_LOG_FLUSH_SECONDS", 3.0)
+LOG_BATCH_CHARS = 1900
+
+
+def _batch_lines(lines: List[str]) -> List[str]:
+    """Joins log lines with newlines into as few messages of at most LOG_BATCH_CHARS as possible."""
+    batches: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        if len(line) > LOG_BATCH_CHARS:
+            line = line[:LOG_BATCH_CHARS - 1] + "…"
+        if current and size + 1 + len(line) > LOG_BATCH_CHARS:
+            batches.append("\n".join(current))
+            current, size = [], 0
+        size += len(line) + (1 if current else 0)
+        current.append(line)
+    if current:
+        batches.append("\n".join(current))
+    return batches
+
+
+def _usage_argstr(ctx: commands.Context) -> str:
+    """Readable argument string for a logged command: the message text, else its args/kwargs."""
+    try:
+        message = getattr(ctx, "message", None)
+        if message and isinstance(message, discord.Message):
+            return message.content or ""
+        args = ctx.args[1:] if getattr(ctx, "args", None) else ()
+        kwargs = getattr(ctx, "kwargs", {}) or {}
+        return " ".join(chain((str(a) for a in args), (f"{k}={v!s}" for k, v in kwargs.items())))
+    except Exception:
+        return ""
+
+
+def _describe_reply(m: discord.Message) -> Optional[str]:
+    """Short text for a bot reply: its content, else its first embed, else its attachment names."""
+    if m.content:
+        return m.content
+    if m.embeds:
+        e = m.embeds[0]
+        return f"[embed] {e.title or ''} {e.description or ''}".strip()
+    if m.attachments:
+        return f"[attachment] {', '.join(a.filename for a in m.attachments)}"
+    return None
 
 class UsageLoggerCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # only bounds the channel.history() fallback; the on_message wait uses REPLY_WAIT_SECONDS
         self._response_search_window = timedelta(seconds=5)
+        # channel id -> (invoke time, Future) for logged commands still waiting on a bot reply there;
+        # on_message resolves each Future with the reply text
+        self._pending_replies: Dict[int, List[Tuple[datetime, asyncio.Future]]] = {}
+        # interaction id -> time.monotonic() when it was logged, so no slash invocation is logged twice
+        self._seen_interactions: Dict[int, float] = {}
+        # usage log lines waiting for the next _flush_logs run
+        self._pending_logs: List[str] = []
+        self._flush_logs.start()
         # Register global before/after invoke hooks
         bot.before_invoke(self._before_any_command)
         bot.after_invoke(self._after_any_command)
@@ -82,49 +160,69 @@ class UsageLoggerCog(commands.Cog):
         except Exception:
             pass
 
+    def cog_unload(self):
+        self._flush_logs.cancel()
+
+    def _queue_log(self, log_text: str) -> None:
+        """Queues a usage log line for the next batched send."""
+        self._pending_logs.append(log_text)
+
+    async def _send_pending_logs(self) -> None:
+        if not self._pending_logs:
+            return
+        lines, self._pending_logs = self._pending_logs, []
+        for batch in _batch_lines(lines):
+            try:
+                await _send_log(self.bot, batch)
+            except Exception:
+                logger.exception("Failed to send usage log to discord; falling back to logger")
+                logger.info(batch)
+
+    @tasks.loop(seconds=LOG_FLUSH_SECONDS)
+    async def _flush_logs(self):
+        await self.bot.wait_until_ready()
+        await self._send_pending_logs()
+
+    @_flush_logs.after_loop
+    async def _flush_remaining_logs(self):
+        # send whatever is still queued when the cog is unloaded
+        await self._send_pending_logs()
+
     async def _before_any_command(self, ctx: commands.Context):
         try:
             ctx._usage_invoke_time = utcnow()
             # determine prefix vs interaction
             is_prefix = getattr(ctx, "interaction", None) is None and getattr(ctx, "message", None) is not None
 
-            # determine command name
-            cmd_name = None
-            if getattr(ctx, "command", None):
-                try:
-                    cmd_name = ctx.command.qualified_name
-                except Exception:
-                    cmd_name = getattr(ctx, "invoked_with", None)
-            else:
-                cmd_name = getattr(ctx, "invoked_with", None)
-
+            # Only the skip decision happens here; the argument string is built in
+            # _after_any_command, and only for commands that actually get logged.
             ctx._usage_skip = False
             if is_prefix:
                 if SKIP_ALL_PREFIX:
                     ctx._usage_skip = True
                     return
+                # determine command name
+                cmd_name = None
+                if getattr(ctx, "command", None):
+                    try:
+                        cmd_name = ctx.command.qualified_name
+                    except Exception:
+                        cmd_name = getattr(ctx, "invoked_with", None)
+                else:
+                    cmd_name = getattr(ctx, "invoked_with", None)
                 if cmd_name:
-                    root = cmd_name.split()[0] if isinstance(cmd_name, str) else str(cmd_name)
+                    root = cmd_name.partition(" ")[0] if isinstance(cmd_name, str) else str(cmd_name)
                     if root in SKIP_COMMANDS:
                         ctx._usage_skip = True
                         return
 
-            # capture readable arg string
-            ctx._usage_argstr = ""
-            try:
-                if getattr(ctx, "message", None) and isinstance(ctx.message, discord.Message):
-                    ctx._usage_argstr = ctx.message.content or ""
-                else:
-                    args = ctx.args[1:] if getattr(ctx, "args", None) and len(ctx.args) > 1 else ()
-                    kwargs = getattr(ctx, "kwargs", {}) or {}
-                    parts = []
-                    if args:
-                        parts.append(" ".join(str(a) for a in args))
-                    if kwargs:
-                        parts.append(" ".join(f"{k}={v!s}" for k, v in kwargs.items()))
-                    ctx._usage_argstr = " ".join(parts)
-            except Exception:
-                ctx._usage_argstr = ""
+            # start listening for the bot's reply (quiet commands don't log it)
+            channel = getattr(ctx, "channel", None)
+            cmdname = ctx.command.qualified_name if getattr(ctx, "command", None) else getattr(ctx, "invoked_with", "")
+            if channel is not None and not self._is_quiet_command(cmdname):
+                fut = asyncio.get_running_loop().create_future()
+                ctx._usage_reply_future = fut
+                self._pending_replies.setdefault(channel.id, []).append((ctx._usage_invoke_time, fut))
         except Exception:
             logger.exception("before_invoke failure in UsageLoggerCog")
 
@@ -136,66 +234,113 @@ class UsageLoggerCog(commands.Cog):
         try:
             if not cmdname:
                 return False
-            root = str(cmdname).split()[0].lower()
+            root = str(cmdname).partition(" ")[0].lower()
             return root in QUIET_COMMANDS
         except Exception:
             return False
 
+    def _mark_logged(self, interaction_id: int) -> bool:
+        """Records an interaction as logged. Returns False if it was already logged in the last SEEN_TTL seconds."""
+        now = time.monotonic()
+        seen = self._seen_interactions
+        for key in [k for k, ts in seen.items() if now - ts > SEEN_TTL]:
+            del seen[key]
+        if interaction_id in seen:
+            return False
+        seen[interaction_id] = now
+        return True
+
+    async def _wait_for_reply(self, ctx: commands.Context) -> Optional[str]:
+        """Waits up to REPLY_WAIT_SECONDS for on_message to report the bot's reply to this invocation."""
+        fut = getattr(ctx, "_usage_reply_future", None)
+        if fut is None:
+            return None
+        try:
+            return await asyncio.wait_for(fut, timeout=REPLY_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+
+    def _forget_reply_future(self, ctx: commands.Context) -> None:
+        """Drops this invocation's reply Future from _pending_replies (safe to call more than once)."""
+        fut = getattr(ctx, "_usage_reply_future", None)
+        channel = getattr(ctx, "channel", None)
+        if fut is None or channel is None:
+            return
+        pending = self._pending_replies.get(channel.id)
+        if pending:
+            pending[:] = [entry for entry in pending if entry[1] is not fut]
+            if not pending:
+                del self._pending_replies[channel.id]
+        if not fut.done():
+            fut.cancel()
+
     async def _after_any_command(self, ctx: commands.Context):
         try:
             if getattr(ctx, "_usage_skip", False):
                 return
+            # hybrid commands invoked as slash commands land here (on_interaction skips them),
+            # so they get the "/" prefix; the id is still marked so no interaction logs twice
+            interaction = getattr(ctx, "interaction", None)
+            is_slash = interaction is not None
+            if is_slash and not self._mark_logged(interaction.id):
+                return
 
             invoke_time = getattr(ctx, "_usage_invoke_time", utcnow())
-            argstr = getattr(ctx, "_usage_argstr", "")
             user = ctx.author
             channel = getattr(ctx, "channel", None)
             cmdname = ctx.command.qualified_name if getattr(ctx, "command", None) else getattr(ctx, "invoked_with", "unknown")
+            chan_repr = f"#{channel.name}" if isinstance(channel, discord.TextChannel) else (f"DM with {user}" if channel is None else str(channel))
 
             # If this command is in the quiet list, only post a minimal acknowledgement.
             if self._is_quiet_command(cmdname):
-                chan_repr = f"#{channel.name}" if isinstance(channel, discord.TextChannel) else (f"DM with {user}" if channel is None else str(channel))
-                cmd_display = f"/{cmdname}" if getattr(ctx, "interaction", None) else f"{cmdname}"
-                log_text = f"<@{user.id}> used {cmd_display} in {chan_repr}"
-                try:
-                    await _send_log(self.bot, log_text)
-                except Exception:
-                    logger.exception("Failed to send usage log to discord; falling back to logger")
-                    logger.info(log_text)
+                cmd_display = f"/{cmdname}" if is_slash else cmdname
+                self._queue_log(_LOG_TEMPLATE.format_map({
+                    "user_id": user.id, "cmd": cmd_display, "args": "", "chan": chan_repr, "reply": "",
+                }))
                 return
 
-            bot_reply_text = None
-            try:
-                if isinstance(channel, (discord.TextChannel, discord.abc.Messageable)):
-                    async for m in channel.history(limit=6, after=invoke_time, oldest_first=True):
-                        if m.author and m.author.id == self.bot.user.id:
-                            if m.content:
-                                bot_reply_text = m.content
-                                break
-                            if m.embeds:
-                                e = m.embeds[0]
-                                bot_reply_text = f"[embed] {e.title or ''} {e.description or ''}".strip()
-                                break
-                            if m.attachments:
-                                bot_reply_text = f"[attachment] {', '.join(a.filename for a in m.attachments)}"
-                                break
-            except Exception:
-                logger.debug("Could not search channel history for bot reply (safe to ignore).", exc_info=True)
-
-            chan_repr = f"#{channel.name}" if isinstance(channel, discord.TextChannel) else (f"DM with {user}" if channel is None else str(channel))
-            cmd_display = f"/{cmdname}" if getattr(ctx, "interaction", None) else f"{cmdname}"
-            arg_display = f' "{argstr}"' if argstr else ""
-            reply_display = f' "{bot_reply_text}"' if bot_reply_text else " (no bot reply captured)"
-
-            log_text = f"<@{user.id}> used {cmd_display}{arg_display} in {chan_repr}{reply_display}"
+            argstr = _usage_argstr(ctx)
+            bot_reply_text = await self._wait_for_reply(ctx)
+            if bot_reply_text is None and str(cmdname).partition(" ")[0].lower() in HISTORY_FALLBACK_COMMANDS:
+                try:
+                    if isinstance(channel, discord.abc.Messageable):
+                        bot_user_id = self.bot.user.id
+                        window_end = invoke_time + self._response_search_window
+                        async for m in channel.history(limit=6, after=invoke_time, before=window_end, oldest_first=True):
+                            if m.author is not None and m.author.id == bot_user_id:
+                                bot_reply_text = _describe_reply(m)
+                                if bot_reply_text:
+                                    break
+                except Exception:
+                    logger.debug("Could not search channel history for bot reply (safe to ignore).", exc_info=True)
 
-            try:
-                await _send_log(self.bot, log_text)
-            except Exception:
-                logger.exception("Failed to send usage log to discord; falling back to logger")
-                logger.info(log_text)
+            self._queue_log(_LOG_TEMPLATE.format_map({
+                "user_id": user.id,
+                "cmd": f"/{cmdname}" if is_slash else cmdname,
+                "args": f' "{argstr}"' if argstr else "",
+                "chan": chan_repr,
+                "reply": f' "{bot_reply_text}"' if bot_reply_text else " (no bot reply captured)",
+            }))
         except Exception:
             logger.exception("after_invoke failure in UsageLoggerCog")
+        finally:
+            self._forget_reply_future(ctx)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # hand the bot's own messages to invocations in this channel that are waiting for a reply
+        pending = self._pending_replies.get(message.channel.id)
+        if not pending:
+            return
+        bot_user = self.bot.user
+        if bot_user is None or message.author.id != bot_user.id:
+            return
+        text = _describe_reply(message)
+        if not text:
+            return
+        for invoke_time, fut in pending:
+            if not fut.done() and message.created_at > invoke_time:
+                fut.set_result(text)
 
     @commands.Cog.listener()
     async def on_interaction(self, interaction: discord.Interaction):
@@ -206,15 +351,21 @@ class UsageLoggerCog(commands.Cog):
             data = interaction.data or {}
             name = data.get("name", "unknown")
 
+            # Hybrid commands are logged by _after_any_command, which has the ctx-derived args and
+            # can capture the reply; only pure app commands are logged here.
+            if isinstance(self.bot.get_command(name), (commands.HybridCommand, commands.HybridGroup)):
+                return
+            if not self._mark_logged(interaction.id):
+                return
+
+            chan = interaction.channel
+            chan_repr = f"#{chan.name}" if isinstance(chan, discord.TextChannel) else str(chan)
+
             # If this slash command is quiet, only send a minimal acknowledgement
             if self._is_quiet_command(name):
-                chan = interaction.channel
-                chan_repr = f"#{chan.name}" if isinstance(chan, discord.TextChannel) else str(chan)
-                log_text = f"<@{user.id}> used /{name} in {chan_repr}"
-                try:
-                    await _send_log(self.bot, log_text)
-                except Exception:
-                    logger.exception("Failed to send interaction usage log")
+                self._queue_log(_LOG_TEMPLATE.format_map({
+                    "user_id": user.id, "cmd": f"/{name}", "args": "", "chan": chan_repr, "reply": "",
+                }))
                 return
 
             args_display = ""
@@ -232,15 +383,13 @@ class UsageLoggerCog(commands.Cog):
             except Exception:
                 args_display = ""
 
-            chan = interaction.channel
-            chan_repr = f"#{chan.name}" if isinstance(chan, discord.TextChannel) else str(chan)
-            arg_display = f' "{args_display}"' if args_display else ""
-            log_text = f"<@{user.id}> used /{name}{arg_display} in {chan_repr}"
-
-            try:
-                await _send_log(self.bot, log_text)
-            except Exception:
-                logger.exception("Failed to send interaction usage log")
+            self._queue_log(_LOG_TEMPLATE.format_map({
+                "user_id": user.id,
+                "cmd": f"/{name}",
+                "args": f' "{args_display}"' if args_display else "",
+                "chan": chan_repr,
+                "reply": "",
+            }))
         except Exception:
             logger.exception("on_interaction failure in UsageLoggerCog")
 
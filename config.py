@@ -30,9 +30,24 @@ DATA_DIR = Path("data")
 # The main database file for storing user progress, settings, etc.
 DB_PATH = DATA_DIR / "collected_pieces.json"
 
+# Write the database file as indented, human-readable JSON (slower and larger; useful for debugging).
+DB_PRETTY_JSON = False
+
+# Debounced saves (utils.db_utils.mark_dirty): wait this many seconds to coalesce a burst of changes
+# into one write, or write sooner once this many changes are pending.
+DB_SAVE_DEBOUNCE_SECONDS = 0.5
+DB_SAVE_MAX_PENDING = 50
+
+# Store utils.db_utils.backup_data() copies compressed (zstd if the zstandard package is installed, else gzip).
+# The live database file itself always stays plain JSON.
+DB_BACKUP_COMPRESS = False
+
 # The backup directory for the database.
 BACKUP_DIR = DATA_DIR / "backups"
 
+# How many utils.db_utils.backup_data() snapshots to keep in BACKUP_DIR (0 keeps all of them).
+DB_BACKUP_KEEP = 20
+
 # The root directory where puzzle assets (images, metadata) are stored.
 PUZZLES_ROOT = Path("puzzles")
 
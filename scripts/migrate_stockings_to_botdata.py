@@ -10,7 +10,7 @@ This script will:
  - write using utils.db_utils.save_data if available; otherwise write to data/collected_pieces.json
 """
 from __future__ import annotations
-import json, shutil, sys
+import json, os, shutil, sys
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -45,8 +45,11 @@ def save_collected(bot_data):
     else:
         if not COLLECTED_FILE.parent.exists():
             COLLECTED_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with COLLECTED_FILE.open("w", encoding="utf-8") as fh:
+        # write a temp file and swap it in; backups may be hardlinks to the live file
+        tmp = COLLECTED_FILE.with_name(COLLECTED_FILE.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
             json.dump(bot_data, fh, ensure_ascii=False, indent=2)
+        os.replace(tmp, COLLECTED_FILE)
         print("Wrote", COLLECTED_FILE)
 
 def main():
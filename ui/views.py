@@ -10,12 +10,12 @@ from PIL import Image as PILImage
 import config
 from utils.db_utils import (
     add_piece_to_user,
-    save_data,
+    mark_dirty,
     get_puzzle_display_name,
     get_user_pieces,
 )
 from .overlay import render_progress_image
-from utils.theme import Emojis, Colors, THEMES, PUZZLE_CONFIG
+from utils.theme import Emojis, Colors, PUZZLE_CONFIG, PUZZLE_TO_THEME
 
 logger = logging.getLogger(__name__)
 
@@ -189,8 +189,8 @@ class DropView(discord.ui.View):
         if not add_piece_to_user(self.bot.data, interaction.user.id, self.puzzle_key, self.piece_id):
             return await interaction.response.send_message("You already have this piece!", ephemeral=True)
 
-        # Persist state immediately
-        save_data(self.bot.data)
+        # Persist state (debounced so a burst of collects becomes one write)
+        mark_dirty(self.bot.data)
         self.claimants.append(interaction.user)
 
         # Acknowledge the collect to the claimer
@@ -229,7 +229,7 @@ class DropView(discord.ui.View):
             finishers = self.bot.data.setdefault("puzzle_finishers", {}).setdefault(self.puzzle_key, [])
             if user_id not in [f.get("user_id") for f in finishers]:
                 finishers.append({"user_id": user_id})
-                save_data(self.bot.data)
+                mark_dirty(self.bot.data)
 
         # If we've hit claim limit, remove the button, edit, post summary and stop.
         if len(self.claimants) >= self.claim_limit:
@@ -328,8 +328,7 @@ class PuzzleGalleryView(discord.ui.View):
     async def generate_embed_and_file(self) -> Tuple[discord.Embed, Optional[discord.File]]:
         puzzle_key = self.user_puzzle_keys[self.current_index]
         meta = PUZZLE_CONFIG.get(puzzle_key, {})
-        theme_name = meta.get("theme")
-        theme = THEMES.get(theme_name) if theme_name else None
+        theme = PUZZLE_TO_THEME.get(puzzle_key)
 
         display_name = meta.get("display_name", get_puzzle_display_name(self.bot.data, puzzle_key))
 
@@ -538,8 +537,7 @@ class LeaderboardView(discord.ui.View):
 
     async def generate_embed(self) -> discord.Embed:
         meta = PUZZLE_CONFIG.get(self.puzzle_key, {})
-        theme_name = meta.get("theme")
-        theme = THEMES.get(theme_name) if theme_name else None
+        theme = PUZZLE_TO_THEME.get(self.puzzle_key)
 
         display_name = meta.get("display_name", get_puzzle_display_name(self.bot.data, self.puzzle_key))
         emoji = theme.emoji if theme else Emojis.TROPHY
@@ -50,13 +50,18 @@ LOG_PATH = Path("/var/log/backup-run.log")
 if not os.access(LOG_PATH.parent, os.W_OK):
     LOG_PATH = BACKUP_DIR / "backup-run.log"
 
+# Snapshot the clock once per run; every timestamp below derives from these.
+_NOW = datetime.now()
+_UTCNOW = datetime.utcnow()
+_UTCNOW_ISO = _UTCNOW.isoformat()
+
 def log_marker(msg: str):
     try:
         with LOG_PATH.open("a", encoding="utf-8") as fh:
-            fh.write(f"{datetime.utcnow().isoformat()} {msg}\n")
+            fh.write(f"{_UTCNOW_ISO} {msg}\n")
     except Exception:
         # last resort: print to stderr
-        print(f"{datetime.utcnow().isoformat()} {msg}", file=sys.stderr)
+        print(f"{_UTCNOW_ISO} {msg}", file=sys.stderr)
 
 # --- Run ---
 src = (DATA_DIR / DATA_FILE)
@@ -64,7 +69,7 @@ if not src.exists():
     log_marker(f"ABORT: source file not found: {src}")
     sys.exit(1)
 
-timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+timestamp = _NOW.strftime("%Y%m%d-%H%M%S")
 backup_file = f"collected_pieces_{timestamp}.json"
 hourly_backup = BACKUP_DIR / backup_file
 
@@ -79,7 +84,7 @@ import subprocess
 from pathlib import Path
 
 try:
-    report_name = f"ww_report_{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.txt"
+    report_name = f"ww_report_{_UTCNOW.strftime('%Y%m%d-%H%M%S')}.txt"
     report_path = Path(BACKUP_DIR) / report_name
     # Use the venv python so it runs with the same environment as cron did
     subprocess.run([
@@ -91,7 +96,7 @@ try:
 except Exception as e:
     # non-fatal; log to backup-run.log if available
     try:
-        LOG_PATH.write_text(f"{datetime.utcnow().isoformat()} REPORT_FAIL: {e}\n", encoding="utf-8", append=False)
+        LOG_PATH.write_text(f"{_UTCNOW_ISO} REPORT_FAIL: {e}\n", encoding="utf-8", append=False)
     except Exception:
         pass
 
@@ -118,7 +123,7 @@ for fn, dt in backups:
         daily_snapshots[day] = (fn, dt)
 
 # preserve intervals (0,6,12,18) for today only
-now = datetime.now()
+now = _NOW
 intervals = [0, 6, 12, 18]
 interval_files = []
 for h in intervals:
@@ -132,18 +137,28 @@ for h in intervals:
     if closest:
         interval_files.append(closest[0])
 
-preserve = set(fn for fn, dt in daily_snapshots.values())
+preserve = {fn for fn, _ in daily_snapshots.values()}
 preserve.update(interval_files)
 
 # Delete others (robust: only remove files that match expected pattern)
-removed = 0
-for fn, dt in backups:
-    if fn not in preserve:
+to_remove = [os.path.join(BACKUP_DIR, fn) for fn, _ in backups if fn not in preserve]
+if len(to_remove) > 32:
+    # unlink in inode order for larger batches; friendlier to the directory/inode caches
+    def _inode(path: str) -> int:
         try:
-            p = BACKUP_DIR / fn
-            p.unlink()
-            removed += 1
-        except Exception:
-            log_marker(f"ROTATION_FAIL: could not remove {fn}")
+            return os.stat(path).st_ino
+        except OSError:
+            return 0
+    to_remove.sort(key=_inode)
+
+removed = 0
+for path in to_remove:
+    try:
+        os.unlink(path)
+        removed += 1
+    except FileNotFoundError:
+        pass
+    except OSError:
+        log_marker(f"ROTATION_FAIL: could not remove {os.path.basename(path)}")
 
 log_marker(f"ROTATION_DONE: removed={removed} keep={len(preserve)} backups dir={BACKUP_DIR}")
\ No newline at end of file
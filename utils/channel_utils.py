@@ -9,7 +9,7 @@ import json
 import re
 import unicodedata
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 import discord
 
@@ -33,6 +33,8 @@ HARDCODED_CATEGORY_ALIASES: Dict[str, int] = {
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+_CHANNEL_MENTION_RE = re.compile(r"<#(\d+)>$")
+
 
 def _normalize(text: Optional[str]) -> str:
     if text is None:
@@ -45,26 +47,43 @@ def _normalize(text: Optional[str]) -> str:
     return s.strip()
 
 
+# Hardcoded aliases never change at runtime, so normalize them once at import.
+_NORMALIZED_ALIASES: Dict[str, int] = { _normalize(k): int(v) for k, v in HARDCODED_ALIASES.items() }
+
+# (mtime_ns, aliases) of the last ALIASES_FILE read; reloaded only when the file changes.
+_aliases_cache: Optional[Tuple[int, Dict[str, int]]] = None
+
+
 def load_aliases() -> Dict[str, int]:
+    global _aliases_cache
     if USE_HARDCODED:
-        return { _normalize(k): int(v) for k, v in HARDCODED_ALIASES.items() }
+        return _NORMALIZED_ALIASES
+    try:
+        mtime_ns = ALIASES_FILE.stat().st_mtime_ns
+    except OSError:
+        return {}
+    if _aliases_cache is not None and _aliases_cache[0] == mtime_ns:
+        return _aliases_cache[1]
     try:
-        if ALIASES_FILE.exists():
-            with ALIASES_FILE.open("r", encoding="utf-8") as fh:
-                data = json.load(fh) or {}
-                return { _normalize(str(k)): int(v) for k, v in data.items() }
+        with ALIASES_FILE.open("r", encoding="utf-8") as fh:
+            data = json.load(fh) or {}
+            aliases = { _normalize(str(k)): int(v) for k, v in data.items() }
     except Exception:
-        pass
-    return {}
+        return {}
+    _aliases_cache = (mtime_ns, aliases)
+    return aliases
 
 
 def save_aliases(data: Dict[str, int]) -> None:
+    global _aliases_cache
     if USE_HARDCODED:
         return
     try:
         ALIASES_FILE.parent.mkdir(parents=True, exist_ok=True)
         with ALIASES_FILE.open("w", encoding="utf-8") as fh:
             json.dump({str(k): int(v) for k, v in data.items()}, fh, ensure_ascii=False, indent=2)
+        # prime the cache with what was just written so the next load_aliases() doesn't re-read it
+        _aliases_cache = (ALIASES_FILE.stat().st_mtime_ns, { _normalize(str(k)): int(v) for k, v in data.items() })
     except Exception:
         pass
 
@@ -73,7 +92,7 @@ def set_alias(alias: str, channel_id: int) -> None:
     if USE_HARDCODED:
         raise RuntimeError("Aliases are hardcoded in utils/channel_utils.py (USE_HARDCODED=True). Edit HARDCODED_ALIASES in this file.")
     norm = _normalize(alias)
-    aliases = load_aliases()
+    aliases = dict(load_aliases())
     aliases[norm] = int(channel_id)
     save_aliases(aliases)
 
@@ -82,7 +101,7 @@ def remove_alias(alias: str) -> bool:
     if USE_HARDCODED:
         raise RuntimeError("Aliases are hardcoded in utils/channel_utils.py (USE_HARDCODED=True). Edit HARDCODED_ALIASES in this file.")
     norm = _normalize(alias)
-    aliases = load_aliases()
+    aliases = dict(load_aliases())
     if norm in aliases:
         del aliases[norm]
         save_aliases(aliases)
@@ -91,7 +110,7 @@ def remove_alias(alias: str) -> bool:
 
 
 def list_aliases() -> Dict[str, int]:
-    return load_aliases()
+    return dict(load_aliases())
 
 
 async def resolve_channel(bot: discord.Client, guild: Optional[discord.Guild], identifier: Optional[Any]) -> Optional[discord.TextChannel]:
@@ -102,20 +121,20 @@ async def resolve_channel(bot: discord.Client, guild: Optional[discord.Guild], i
         return None
     ident = str(identifier).strip()
 
+    # numeric id (most common: snowflakes passed straight from command arguments)
+    if ident.isdigit():
+        ch = bot.get_channel(int(ident))
+        if isinstance(ch, discord.TextChannel):
+            return ch
+
     # mention <#id>
-    m = re.match(r"<#(\d+)>$", ident)
+    m = _CHANNEL_MENTION_RE.match(ident)
     if m:
         cid = int(m.group(1))
         ch = bot.get_channel(cid)
         if isinstance(ch, discord.TextChannel):
             return ch
 
-    # numeric id
-    if ident.isdigit():
-        ch = bot.get_channel(int(ident))
-        if isinstance(ch, discord.TextChannel):
-            return ch
-
     # alias lookup
     aliases = load_aliases()
     norm = _normalize(ident)
@@ -133,13 +152,18 @@ async def resolve_channel(bot: discord.Client, guild: Optional[discord.Guild], i
             pass
 
     # name/display_name matching in guild
+    # (single pass: an exact match wins, otherwise the first prefix match is used)
     if guild:
+        prefix_match = None
         for ch in guild.text_channels:
-            if _normalize(ch.name) == norm or _normalize(getattr(ch, "display_name", "")) == norm:
-                return ch
-        for ch in guild.text_channels:
-            if _normalize(ch.name).startswith(norm) or _normalize(getattr(ch, "display_name", "")).startswith(norm):
+            n_name = _normalize(ch.name)
+            n_display = _normalize(getattr(ch, "display_name", ""))
+            if n_name == norm or n_display == norm:
                 return ch
+            if prefix_match is None and (n_name.startswith(norm) or n_display.startswith(norm)):
+                prefix_match = ch
+        if prefix_match is not None:
+            return prefix_match
 
     # fallback: search all channels in cache
     for ch in bot.get_all_channels():
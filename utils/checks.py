@@ -7,6 +7,7 @@ from .theme import Emojis
 # --- Define your Role IDs here ---
 STAFF_ROLE_ID = 1309962372542234657
 ADMIN_ROLE_ID = 1309962372542234661
+_STAFF_OR_ADMIN = (STAFF_ROLE_ID, ADMIN_ROLE_ID)
 
 
 def is_staff():
@@ -27,11 +28,8 @@ def is_staff():
         if isinstance(author, discord.Member) and author.guild_permissions.administrator:
             return True
 
-        # Check if the user has one of the required roles.
-        required_roles = {STAFF_ROLE_ID, ADMIN_ROLE_ID}
-        user_roles = {role.id for role in author.roles}
-
-        if not user_roles.isdisjoint(required_roles):
+        # Check if the user has one of the required roles (get_role is an O(1) lookup by ID).
+        if isinstance(author, discord.Member) and any(author.get_role(role_id) is not None for role_id in _STAFF_OR_ADMIN):
             return True
 
         # If all checks fail, send a clear error message.
@@ -57,7 +55,7 @@ def is_admin():
         if isinstance(author, discord.Member) and author.guild_permissions.administrator:
             return True
 
-        if any(role.id == ADMIN_ROLE_ID for role in author.roles):
+        if isinstance(author, discord.Member) and author.get_role(ADMIN_ROLE_ID) is not None:
             return True
 
         await ctx.send(f"{Emojis.FAILURE} You need the Admin role to use this command.", ephemeral=True)
@@ -1,41 +1,294 @@
+import asyncio
+import gzip
+import hashlib
+import itertools
 import json
 import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from math import isqrt
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import config
 
+# orjson is optional; it is considerably faster for large data files but the stdlib json works everywhere.
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# zstandard is optional; compressed backups use it when installed and fall back to gzip otherwise.
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+# collected_pieces.json stays plain JSON: cogs/stocking_cog.py, ww_pieces_report.py and the
+# backup/restore scripts read it directly, so a binary format here would split the data store.
 DATA_FILE = Path(__file__).parent.parent / "data" / "collected_pieces.json"
 logger = logging.getLogger(__name__)
 
+# Indented output is only for eyeballing the file while debugging; compact JSON is smaller and faster to write.
+PRETTY_JSON = getattr(config, "DB_PRETTY_JSON", False)
+
+# backup_data() writes timestamped copies here and keeps only the newest BACKUP_KEEP of them (0 keeps all).
+# A relative config path (config.py uses "data/backups") is taken from the repo root like DATA_FILE,
+# not from the process CWD, so backups stay beside the data file (and hardlinkable to it).
+BACKUP_DIR = Path(getattr(config, "BACKUP_DIR", DATA_FILE.parent / "backups"))
+if not BACKUP_DIR.is_absolute():
+    BACKUP_DIR = DATA_FILE.parent.parent / BACKUP_DIR
+BACKUP_KEEP = getattr(config, "DB_BACKUP_KEEP", 20)
+
+# Compress backup_data() copies (the piece-ID text compresses several times over).
+BACKUP_COMPRESS = getattr(config, "DB_BACKUP_COMPRESS", False)
+
+# Piece image stems look like "p12" or "12"; the captured digits are the piece ID.
+_PIECE_RE = re.compile(r"^p?(\d+)$")
+
+# Last loaded/saved data and the data file's mtime at that point; load_data only re-parses when it changes.
+# "seq" is the sequence number of the last save written, so an older save finishing late is dropped.
+_cache: Dict[str, Any] = {"data": None, "mtime_ns": 0, "seq": 0}
+_cache_lock = threading.RLock()
+_save_seq = itertools.count(1)
+
+# Debounced saves: mark_dirty() records the latest data and run_save_flusher() writes it once per burst.
+SAVE_DEBOUNCE_SECONDS = getattr(config, "DB_SAVE_DEBOUNCE_SECONDS", 0.5)
+SAVE_MAX_PENDING = getattr(config, "DB_SAVE_MAX_PENDING", 50)
+_pending_save: Dict[str, Any] = {"data": None, "count": 0}
+_save_dirty = asyncio.Event()
+_save_full = asyncio.Event()
+
+# Bumped when puzzles are (re)loaded or re-synced from disk (not on saves, which never change them);
+# invalidates the display-name index.
+_data_version = 0
+_display_index: Dict[str, str] = {}
+_display_index_key: Tuple[int, int] = (0, -1)
+
+# Fingerprint of PUZZLES_ROOT at the last sync_from_fs, plus the puzzles/pieces dicts it produced.
+_last_fs_sync: Dict[str, Any] = {"fingerprint": None, "puzzles": None, "pieces": None}
+
+# Parsed meta.json files keyed by path, with the mtime they were parsed at; only changed files are re-read.
+_META_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
 # ===============================
 # 1. Data Loading & Saving
 # ===============================
+def _piece_sort_key(piece_id: Any):
+    """Sort key that orders numeric piece IDs numerically and everything else after them."""
+    s = str(piece_id)
+    return (0, int(s), s) if s.isdigit() else (1, 0, s)
+
+def _json_default(obj: Any) -> Any:
+    """Serializes in-memory piece sets as sorted lists so the file format stays plain JSON."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=_piece_sort_key)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _collections_to_sets(data: Dict[str, Any]) -> None:
+    """Converts each user's per-puzzle piece lists into sets for O(1) membership checks."""
+    user_pieces = data.get("user_pieces")
+    if not isinstance(user_pieces, dict):
+        return
+    for collection in user_pieces.values():
+        if not isinstance(collection, dict):
+            continue
+        for puzzle_key, pieces in collection.items():
+            if isinstance(pieces, list):
+                collection[puzzle_key] = set(pieces)
+
+def _loads(buf: bytes) -> Any:
+    """Parses UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serializes the data dictionary to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+        return orjson.dumps(data, default=_json_default, option=option)
+    indent = 4 if PRETTY_JSON else None
+    return json.dumps(data, indent=indent, default=_json_default).encode("utf-8")
+
+def _bump_data_version() -> None:
+    """Marks the display-name index as stale; call only when the puzzles data is replaced."""
+    global _data_version
+    _data_version += 1
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Writes payload to a sibling .tmp file, fsyncs it, then atomically replaces path with it."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    # binary mode: a raw os.open descriptor is text-mode on Windows and would mangle compressed payloads
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 def load_data() -> Dict[str, Any]:
-    """Loads the main data file (collected_pieces.json)."""
-    if DATA_FILE.exists():
+    """
+    Loads the main data file (collected_pieces.json).
+    The parsed data is cached and returned as-is until the file's mtime changes.
+    """
+    with _cache_lock:
+        try:
+            mtime_ns = DATA_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if _cache["data"] is not None and _cache["mtime_ns"] == mtime_ns:
+            return _cache["data"]
         try:
-            with open(DATA_FILE, "r") as f:
-                return json.load(f)
+            data = _loads(DATA_FILE.read_bytes())
+            _collections_to_sets(data)
         except Exception:
             logger.exception("Failed to load collected_pieces.json. Returning empty dictionary.")
-    return {}
+            return {}
+        _cache["data"] = data
+        _cache["mtime_ns"] = mtime_ns
+        _bump_data_version()
+        if isinstance(data.get("puzzles"), dict):
+            _get_display_index(data["puzzles"])
+        return data
+
+def _write_payload(data: Dict[str, Any], payload: bytes, seq: int) -> None:
+    """
+    Atomically writes already-serialized data and refreshes the load cache.
+    seq comes from _save_seq when the payload was serialized; if a newer save has already
+    been written (overlapping async/thread saves finishing out of order), this one is dropped.
+    """
+    with _cache_lock:
+        if seq < _cache["seq"]:
+            logger.debug("Dropping stale save (seq %s < %s).", seq, _cache["seq"])
+            return
+        _atomic_write(DATA_FILE, payload)
+        _cache["data"] = data
+        _cache["mtime_ns"] = DATA_FILE.stat().st_mtime_ns
+        _cache["seq"] = seq
 
 def save_data(data: Dict[str, Any]) -> None:
-    """Saves the provided dictionary to the data file."""
+    """
+    Saves the provided dictionary to the data file.
+    Writes to a temporary file first and atomically replaces the original,
+    so a crash mid-write never leaves a truncated collected_pieces.json behind.
+    """
+    try:
+        seq = next(_save_seq)
+        _write_payload(data, _dumps(data), seq)
+    except Exception:
+        logger.exception("Failed to save data to collected_pieces.json.")
+
+async def save_data_async(data: Dict[str, Any]) -> None:
+    """
+    Async counterpart of save_data for use inside cogs.
+    Serializes on the event loop (so the data can't change mid-encode) and
+    runs the blocking file write + fsync in a worker thread. Saves are numbered
+    when they start, so overlapping saves can't leave an older snapshot on disk.
+    """
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        seq = next(_save_seq)
+        payload = _dumps(data)
+        await asyncio.to_thread(_write_payload, data, payload, seq)
     except Exception:
         logger.exception("Failed to save data to collected_pieces.json.")
 
+def mark_dirty(data: Dict[str, Any]) -> None:
+    """
+    Schedules a save of `data` instead of writing it immediately.
+    Bursts of mutations are coalesced into one write by run_save_flusher().
+    """
+    _pending_save["data"] = data
+    _pending_save["count"] += 1
+    _save_dirty.set()
+    if _pending_save["count"] >= SAVE_MAX_PENDING:
+        _save_full.set()
+
+async def run_save_flusher() -> None:
+    """
+    Background task (started from the bot's setup_hook) that writes pending data.
+    Waits SAVE_DEBOUNCE_SECONDS after the first mark_dirty(), or less once
+    SAVE_MAX_PENDING mutations have piled up, then saves once.
+    """
+    while True:
+        await _save_dirty.wait()
+        try:
+            await asyncio.wait_for(_save_full.wait(), timeout=SAVE_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        data = _pending_save["data"]
+        _pending_save["data"] = None
+        _pending_save["count"] = 0
+        _save_dirty.clear()
+        _save_full.clear()
+        if data is None:
+            continue
+        await save_data_async(data)
+
+def flush_pending_save() -> None:
+    """Synchronously writes any save still waiting in the debounce window (call on shutdown)."""
+    data = _pending_save["data"]
+    if data is not None:
+        _pending_save["data"] = None
+        _pending_save["count"] = 0
+        save_data(data)
+
+def _compress(payload: bytes) -> Tuple[bytes, str]:
+    """Compresses a backup payload with zstd (level 3) if available, else gzip. Returns (data, suffix)."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(payload), ".zst"
+    return gzip.compress(payload), ".gz"
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Makes dst a snapshot of src, as a hardlink when possible (no bytes copied) and with
+    shutil.copy2 otherwise (e.g. a different filesystem). The hardlink stays a valid snapshot
+    because the data file is only ever replaced via os.replace, never rewritten in place.
+    """
+    if dst.exists() and os.path.samefile(src, dst):
+        return  # already a link to the current data file
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+def _prune_backups() -> None:
+    """Deletes all but the newest BACKUP_KEEP backup_data() files (the timestamped names sort chronologically)."""
+    if BACKUP_KEEP <= 0:
+        return
+    prefix = f"backup_{DATA_FILE.stem}_"
+    with os.scandir(BACKUP_DIR) as it:
+        names = sorted(e.name for e in it if e.name.startswith(prefix) and not e.name.endswith(".tmp"))
+    for name in names[:-BACKUP_KEEP]:
+        try:
+            os.unlink(os.path.join(BACKUP_DIR, name))
+        except FileNotFoundError:
+            pass
+
 def backup_data() -> None:
-    """Creates a backup of the current data file."""
+    """
+    Creates a timestamped backup of the current data file in BACKUP_DIR (the original stays in place)
+    and prunes older ones so only the newest BACKUP_KEEP remain.
+    With DB_BACKUP_COMPRESS the copy is written as .json.zst / .json.gz instead.
+    """
     if DATA_FILE.exists():
-        backup_file = DATA_FILE.with_suffix(".json.bak")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        backup_file = BACKUP_DIR / f"backup_{DATA_FILE.stem}_{stamp}.json"
         try:
-            DATA_FILE.rename(backup_file)
+            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+            if BACKUP_COMPRESS:
+                payload, suffix = _compress(DATA_FILE.read_bytes())
+                backup_file = backup_file.with_name(backup_file.name + suffix)
+                _atomic_write(backup_file, payload)
+            else:
+                _link_or_copy(DATA_FILE, backup_file)
             logger.info(f"Created backup: {backup_file}")
+            _prune_backups()
         except Exception:
             logger.exception("Failed to create data backup.")
 
@@ -44,32 +297,40 @@ def backup_data() -> None:
 # ===============================
 def get_user_pieces(bot_data: Dict[str, Any], user_id: int, puzzle_key: str) -> list:
     """
-    Returns a list of the collected piece IDs for a given user and puzzle key.
-    If none are found, returns an empty list.
+    Returns a list of the collected piece IDs for a given user and puzzle key,
+    sorted by piece number. If none are found, returns an empty list.
     """
     user_id_str = str(user_id)
-    return bot_data.get("user_pieces", {}).get(user_id_str, {}).get(puzzle_key, [])
+    pieces = bot_data.get("user_pieces", {}).get(user_id_str, {}).get(puzzle_key)
+    if not pieces:
+        return []
+    return sorted(pieces, key=_piece_sort_key)
 
 def add_piece_to_user(bot_data: Dict[str, Any], user_id: int, puzzle_key: str, piece_id: str) -> bool:
     """Adds a puzzle piece to a user's collection. Returns True if added, False if already owned."""
-    user_id_str = str(user_id)
-    user_pieces = bot_data.setdefault("user_pieces", {})
-    user_collection = user_pieces.setdefault(user_id_str, {})
-    puzzle_pieces = user_collection.setdefault(puzzle_key, [])
-    if piece_id not in puzzle_pieces:
-        puzzle_pieces.append(piece_id)
-        return True
-    return False
+    user_collection = bot_data.setdefault("user_pieces", {}).setdefault(str(user_id), {})
+    pieces = user_collection.setdefault(puzzle_key, set())
+    if piece_id in pieces:
+        return False
+    if not isinstance(pieces, set):
+        # legacy list written by another cog; upgrade it once
+        pieces = user_collection[puzzle_key] = set(pieces)
+    pieces.add(piece_id)
+    return True
 
 def remove_piece_from_user(bot_data: Dict[str, Any], user_id: int, puzzle_key: str, piece_id: str) -> bool:
     """Removes a puzzle piece from a user. Returns True if removed."""
     user_collection = bot_data.get("user_pieces", {}).get(str(user_id), {})
-    if puzzle_key in user_collection and piece_id in user_collection[puzzle_key]:
-        user_collection[puzzle_key].remove(piece_id)
-        if not user_collection[puzzle_key]:
-            del user_collection[puzzle_key]
-        return True
-    return False
+    pieces = user_collection.get(puzzle_key)
+    if not pieces or piece_id not in pieces:
+        return False
+    if isinstance(pieces, set):
+        pieces.discard(piece_id)
+    else:
+        pieces.remove(piece_id)
+    if not pieces:
+        del user_collection[puzzle_key]
+    return True
 
 def get_user_collection(bot_data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
     """Retrieves the puzzle collection for a specific user."""
@@ -77,28 +338,48 @@ def get_user_collection(bot_data: Dict[str, Any], user_id: int) -> Dict[str, Any
 
 def wipe_puzzle_from_all(bot_data: Dict[str, Any], puzzle_key: str) -> int:
     """Removes all collected pieces for a specific puzzle from all users. Returns count of affected users."""
-    wiped_count = 0
     user_pieces = bot_data.get("user_pieces", {})
-    for user_id in list(user_pieces.keys()):
-        if puzzle_key in user_pieces[user_id]:
-            del user_pieces[user_id][puzzle_key]
-            wiped_count += 1
-            if not user_pieces[user_id]:
-                del user_pieces[user_id]
-    return wiped_count
+    wiped = {user_id for user_id, collection in user_pieces.items() if puzzle_key in collection}
+    if not wiped:
+        return 0
+    # Rebuild in two passes instead of deleting from the dict one user at a time;
+    # users left with no puzzles by the wipe are dropped, untouched users are kept as-is.
+    stripped = {
+        user_id: {pk: v for pk, v in collection.items() if pk != puzzle_key} if user_id in wiped else collection
+        for user_id, collection in user_pieces.items()
+    }
+    bot_data["user_pieces"] = {
+        user_id: collection for user_id, collection in stripped.items() if collection or user_id not in wiped
+    }
+    return len(wiped)
 
 # ===============================
 # 3. Puzzle & Piece Management
 # ===============================
+def _get_display_index(puzzles: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Returns a lowercase display_name -> puzzle key index for the given puzzles dict.
+    Rebuilt only when a different puzzles dict is passed or the data version changes;
+    load_data and sync_from_fs build it up front so lookups never pay for lower().
+    """
+    global _display_index, _display_index_key
+    key = (id(puzzles), _data_version)
+    if _display_index_key != key:
+        index: Dict[str, str] = {}
+        for puzzle_key, meta in puzzles.items():
+            # first puzzle wins on duplicate display names, matching the old linear scan
+            index.setdefault(meta.get("display_name", "").lower(), puzzle_key)
+        _display_index = index
+        _display_index_key = key
+    return _display_index
+
 def resolve_puzzle_key(bot_data: Dict[str, Any], puzzle_input: str) -> Optional[str]:
     """Finds a puzzle's key from either its key or display name (case-insensitive)."""
     puzzles = bot_data.get("puzzles", {})
+    puzzle_input = puzzle_input.strip()
     if puzzle_input in puzzles:
         return puzzle_input
-    for key, meta in puzzles.items():
-        if meta.get("display_name", "").lower() == puzzle_input.lower():
-            return key
-    return None
+    return _get_display_index(puzzles).get(puzzle_input.lower())
 
 def get_puzzle_display_name(bot_data: Dict[str, Any], puzzle_key: str) -> str:
     """Gets the display name for a puzzle, falling back to a formatted key."""
@@ -110,6 +391,38 @@ def get_puzzle_display_name(bot_data: Dict[str, Any], puzzle_key: str) -> str:
 # ===============================
 # 4. Filesystem Sync: Piece and Puzzle Indexing
 # ===============================
+def _piece_id(filename: str) -> str:
+    """Derives a piece ID from a piece image filename: "p12.png" -> "12", "p01.png" -> "1"."""
+    stem = filename[:-4]
+    m = _PIECE_RE.match(stem)
+    return (m.group(1).lstrip("0") or "0") if m else stem
+
+def _entry_stat(entry: os.DirEntry) -> os.stat_result:
+    """Stats a scandir entry through symlinks (as sync_from_fs follows them), or the link itself if it is broken."""
+    try:
+        return entry.stat()
+    except OSError:
+        return entry.stat(follow_symlinks=False)
+
+def _fs_fingerprint(puzzle_root: Path) -> str:
+    """
+    Hashes (name, mtime_ns, size) of every entry in puzzle_root and one level below it.
+    Adding/removing piece images bumps the pieces/ directory mtime and editing meta.json
+    bumps its own, so an unchanged digest means a rescan would produce the same result.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with os.scandir(puzzle_root) as it:
+        top = sorted(it, key=lambda e: e.name)
+    for entry in top:
+        st = _entry_stat(entry)
+        h.update(f"{entry.name}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+        if entry.is_dir():
+            with os.scandir(entry.path) as it:
+                for child in sorted(it, key=lambda e: e.name):
+                    st = _entry_stat(child)
+                    h.update(f"{entry.name}/{child.name}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return h.hexdigest()
+
 def sync_from_fs(current_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Scans the puzzle directory and generates a fresh puzzle/piece structure,
@@ -124,59 +437,83 @@ def sync_from_fs(current_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Puzzle root directory not found: {puzzle_root}")
         return current_data
 
-    for puzzle_dir in puzzle_root.iterdir():
-        if not puzzle_dir.is_dir():
-            continue
+    fingerprint = _fs_fingerprint(puzzle_root)
+    if (
+        fingerprint == _last_fs_sync["fingerprint"]
+        and current_data.get("puzzles") is _last_fs_sync["puzzles"]
+        and current_data.get("pieces") is _last_fs_sync["pieces"]
+    ):
+        logger.info("Puzzle directory unchanged since last sync; skipping rescan.")
+        return current_data
 
-        puzzle_key = puzzle_dir.name
+    with os.scandir(puzzle_root) as it:
+        puzzle_entries = [e for e in it if e.is_dir()]
+
+    for puzzle_entry in puzzle_entries:
+        puzzle_key = puzzle_entry.name
         display_name = puzzle_key.replace("_", " ").title()
-        meta_file = puzzle_dir / "meta.json"
+        meta_file = os.path.join(puzzle_entry.path, "meta.json")
         # Default grid
         grid_size = [3, 3]
         rows, cols = 3, 3
-        if meta_file.exists():
-            try:
+        grid_from_meta = False
+        try:
+            mtime_ns = os.stat(meta_file).st_mtime_ns
+            cached = _META_CACHE.get(meta_file)
+            if cached is not None and cached[0] == mtime_ns:
+                meta = cached[1]
+            else:
                 with open(meta_file, 'r') as f:
                     meta = json.load(f)
-                display_name = meta.get("display_name", display_name)
-                grid_size = meta.get("grid_size", grid_size)
-                rows = meta.get("rows", grid_size[0] if isinstance(grid_size, list) else 3)
-                cols = meta.get("cols", grid_size[1] if isinstance(grid_size, list) else 3)
-            except Exception:
-                logger.exception(f"Failed reading meta.json for {puzzle_key}; using defaults.")
-                rows, cols = grid_size
+                _META_CACHE[meta_file] = (mtime_ns, meta)
+            display_name = meta.get("display_name", display_name)
+            grid_size = meta.get("grid_size", grid_size)
+            rows = meta.get("rows", grid_size[0] if isinstance(grid_size, list) else 3)
+            cols = meta.get("cols", grid_size[1] if isinstance(grid_size, list) else 3)
+            grid_from_meta = "rows" in meta or "cols" in meta or "grid_size" in meta
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.exception(f"Failed reading meta.json for {puzzle_key}; using defaults.")
+            rows, cols = grid_size
 
         # Store image_path RELATIVE TO PUZZLES_ROOT
-        image_path = puzzle_dir / "puzzle_image.png"
         puzzles_data[puzzle_key] = {
             "display_name": display_name,
-            "image_path": str(image_path.relative_to(puzzle_root)).replace('\\', '/'),
+            "image_path": f"{puzzle_key}/puzzle_image.png",
             "rows": rows if isinstance(rows, int) else grid_size[0],
             "cols": cols if isinstance(cols, int) else grid_size[1],
         }
 
+        # Pick up "*_base.png" / "*_full.png" from the same directory listing (no extra glob passes)
+        with os.scandir(puzzle_entry.path) as it:
+            top_names = sorted(e.name for e in it if e.name.endswith(("_base.png", "_full.png")))
+        for name in top_names:
+            image_key = "base_image" if name.endswith("_base.png") else "full_image"
+            puzzles_data[puzzle_key].setdefault(image_key, f"{puzzle_key}/{name}")
+
         # Collect piece paths RELATIVE TO PUZZLES_ROOT
-        pieces_dir = puzzle_dir / "pieces"
-        if pieces_dir.is_dir():
-            puzzle_pieces: Dict[str, str] = {}
-            for piece_file in sorted(pieces_dir.glob("*.png")):
-                stem = piece_file.stem
-                # normalize: "p12" -> "12", "12" -> "12"
-                if stem.startswith("p") and stem[1:].isdigit():
-                    piece_id = stem[1:]
-                else:
-                    piece_id = stem
-                # enforce numeric string IDs (so "01" becomes "1")
-                try:
-                    piece_id = str(int(piece_id))
-                except ValueError:
-                    pass
-                rel_path = str(piece_file.relative_to(puzzle_root)).replace('\\', '/')
-                puzzle_pieces[piece_id] = rel_path
-            pieces_data[puzzle_key] = puzzle_pieces
+        try:
+            with os.scandir(os.path.join(puzzle_entry.path, "pieces")) as it:
+                names = [e.name for e in it if e.name.endswith(".png") and e.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        # parse each filename once, then order pieces numerically (p2 before p10)
+        id_names = sorted(((_piece_id(name), name) for name in names), key=lambda pair: (_piece_sort_key(pair[0]), pair[1]))
+        pieces_data[puzzle_key] = {piece_id: "/".join((puzzle_key, "pieces", name)) for piece_id, name in id_names}
+        if not grid_from_meta and id_names:
+            # no grid in meta.json: a square piece count gives an N x N grid; anything else keeps the default
+            count = len(id_names)
+            side = isqrt(count)
+            if side * side == count:
+                puzzles_data[puzzle_key].update(rows=side, cols=side)
 
     # Update in-memory data structure
     current_data["puzzles"] = puzzles_data
     current_data["pieces"] = pieces_data
+    _last_fs_sync.update(fingerprint=fingerprint, puzzles=puzzles_data, pieces=pieces_data)
+    _bump_data_version()
+    # build the display-name lookup now rather than on the first resolve_puzzle_key call
+    _get_display_index(puzzles_data)
     logger.info("Sync from file system complete.")
     return current_data
\ No newline at end of file
@@ -1,12 +1,35 @@
 import logging
 import discord
 from discord.ext import commands
-from typing import Optional
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    import config
+except Exception:  # keep this module importable even if config is missing
+    config = None
+
+# LOG_CHANNEL_ID parsed once at import (int or numeric string in config); None disables send_log.
+try:
+    _LOG_CHANNEL_ID: Optional[int] = int(config.LOG_CHANNEL_ID) if getattr(config, "LOG_CHANNEL_ID", None) else None
+except (TypeError, ValueError):
+    _LOG_CHANNEL_ID = None
+
+# Resolved log channels by id, so send_log doesn't look the channel up (or fetch it over HTTP) on every call.
+# An entry is dropped when sending to it raises NotFound.
+_LOG_CHANNEL_CACHE: Dict[int, discord.abc.Messageable] = {}
+
+# setup_discord_logging() runs once per process (bot.py and UsageLoggerCog both call it), so levels
+# changed at runtime afterwards are not reset by a cog reload.
+_CONFIGURED = False
+
 def setup_discord_logging():
     """Set quieter logging for noisy libraries. Call after root logging is configured."""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
     logging.getLogger("discord.http").setLevel(logging.WARNING)
     logging.getLogger("discord.gateway").setLevel(logging.WARNING)
     logging.getLogger("websockets").setLevel(logging.INFO)
@@ -18,29 +41,28 @@ async def send_log(bot: commands.Bot, message: str, embed: Optional[discord.Embe
     Expects config.LOG_CHANNEL_ID to be set (int or numeric string).
     This function is tolerant: logs locally on failure and never raises.
     """
-    try:
-        import config  # local import so module-level import won't fail if config is missing earlier
-    except Exception:
-        logger.warning("config module not available; cannot send discord log")
-        return
-
-    if not getattr(config, "LOG_CHANNEL_ID", None):
-        logger.debug("LOG_CHANNEL_ID not set; skipping send_log()")
-        return
-
-    try:
-        chan_id = int(config.LOG_CHANNEL_ID)
-    except Exception:
-        logger.debug("LOG_CHANNEL_ID is not an integer; skipping send_log()")
+    chan_id = _LOG_CHANNEL_ID
+    if not chan_id:
+        logger.debug("LOG_CHANNEL_ID not set or not an integer; skipping send_log()")
         return
 
     try:
-        ch = bot.get_channel(chan_id) or await bot.fetch_channel(chan_id)
+        ch = _LOG_CHANNEL_CACHE.get(chan_id)
+        if ch is None:
+            ch = bot.get_channel(chan_id) or await bot.fetch_channel(chan_id)
+            if ch:
+                _LOG_CHANNEL_CACHE[chan_id] = ch
         if ch:
             await ch.send(content=message, embed=embed)
         else:
             logger.warning("send_log: could not resolve channel id %s", chan_id)
-    except (discord.Forbidden, discord.NotFound):
-        logger.exception("send_log: no permission or channel not found for %s", chan_id)
+    except discord.NotFound:
+        _LOG_CHANNEL_CACHE.pop(chan_id, None)
+        logger.exception("send_log: channel not found for %s", chan_id)
+    except discord.Forbidden:
+        logger.exception("send_log: no permission to send to channel %s", chan_id)
+    except discord.HTTPException:
+        # expected transient API failures (5xx, payload rejected); no need for a full traceback
+        logger.warning("send_log: HTTP error while sending to channel %s", chan_id, exc_info=True)
     except Exception:
         logger.exception("send_log: unexpected error while sending to channel %s", chan_id)
\ No newline at end of file
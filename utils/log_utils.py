@@ -1,6 +1,8 @@
 # Compatibility shim: re-export the public helpers from utils.discord_logging
 # and provide a `log` logger object for callers that import it.
-# You can remove this file after you've updated all call sites to import from utils.discord_logging.
+# Everything in this repo imports from utils.discord_logging directly; this file only remains for
+# out-of-tree scripts. Note `log` is a plain logging.Logger, not a coroutine: use send_log() to post
+# to the Discord log channel.
 
 import warnings
 import logging
@@ -7,10 +7,12 @@ DATA_FILE = "collected_pieces.json"
 BACKUP_DIR = r"C:\Users\brian\Desktop\Alice2.0\backups"
 
 def list_backups():
-    return sorted(
-        [f for f in os.listdir(BACKUP_DIR) if f.startswith("collected_pieces_") and f.endswith(".json")],
-        reverse=True
-    )
+    # scandir's DirEntry.is_file() uses the type from the directory listing, so no per-file stat()
+    with os.scandir(BACKUP_DIR) as it:
+        names = [e.name for e in it
+                 if e.name.startswith("collected_pieces_") and e.name.endswith(".json") and e.is_file()]
+    names.sort(reverse=True)
+    return names
 
 def restore_backup(backup_filename):
     src = os.path.join(BACKUP_DIR, backup_filename)
@@ -18,7 +20,11 @@ def restore_backup(backup_filename):
     if not os.path.exists(src):
         print(f"Backup file {backup_filename} does not exist.")
         return
-    shutil.copy2(src, dst)
+    # copy the bytes only (the restored file should carry a fresh mtime so the bot's cache reloads it),
+    # into a temp file that is swapped in atomically so a failed copy never leaves a truncated data file
+    tmp = dst + ".tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
     print(f"Restored {backup_filename} to {dst}")
 
 if __name__ == "__main__":
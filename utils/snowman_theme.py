@@ -8,6 +8,7 @@ Put this in your project (e.g. at repository root) and import from it in cogs.
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Tuple
 
@@ -37,15 +38,14 @@ CANONICAL_COLORS: Dict[str, int] = {
 }
 
 
-def generate_part_maps_from_buildables() -> Tuple[Dict[str, str], Dict[str, int]]:
-    """
-    Read data/buildables.json (if present) and return (part_emoji_map, part_color_map).
-    Falls back to CANONICAL_* if file missing or malformed.
-    """
+@lru_cache(maxsize=4)
+def _load_part_maps(mtime_ns: int) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Parses buildables.json into (part_emoji_map, part_color_map); cached per file mtime."""
     parts_keys = set()
     try:
-        if _BUILDABLES_PATH.exists():
-            data = json.loads(_BUILDABLES_PATH.read_text(encoding="utf-8") or "{}")
+        if mtime_ns:
+            with _BUILDABLES_PATH.open("rb") as fh:
+                data = json.load(fh)
             for bdef in (data or {}).values():
                 for pk in (bdef.get("parts") or {}).keys():
                     parts_keys.add(pk)
@@ -64,4 +64,18 @@ def generate_part_maps_from_buildables() -> Tuple[Dict[str, str], Dict[str, int]
         # fallback: expose canonical list
         part_emoji = dict(CANONICAL_EMOJI)
         part_colors = dict(CANONICAL_COLORS)
-    return part_emoji, part_colors
\ No newline at end of file
+    return part_emoji, part_colors
+
+
+def generate_part_maps_from_buildables() -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Read data/buildables.json (if present) and return (part_emoji_map, part_color_map).
+    Falls back to CANONICAL_* if file missing or malformed.
+    The parse is cached until the file's mtime changes; each call gets its own copies of the maps.
+    """
+    try:
+        mtime_ns = _BUILDABLES_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    part_emoji, part_colors = _load_part_maps(mtime_ns)
+    return dict(part_emoji), dict(part_colors)
@@ -2,7 +2,8 @@ import discord
 
 import json
 from pathlib import Path
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 
 class Emojis:
     SUCCESS = "<:aiwcheck:1448491347836403777>"
@@ -71,13 +72,13 @@ winter_wonderland = Theme(
     button_color=discord.ButtonStyle.primary,
     emoji=Emojis.PUZZLE_PIECE
 )
-THEMES = {
+THEMES = MappingProxyType({
     "happy_thanksgiving_theme": happy_thanksgiving_theme,
     "alice_test_theme": alice_test_theme,
     # Add more themes as needed
-}
+})
 
-PUZZLE_CONFIG = {
+PUZZLE_CONFIG = MappingProxyType({
     "thanksgiving_puzzle": {
         "theme": "happy_thanksgiving_theme"
     },
@@ -85,4 +86,9 @@ PUZZLE_CONFIG = {
         "theme": "alice_test_theme"
     },
     # etc...
-}
+})
+
+# puzzle key -> Theme, resolved once here so callers do a single lookup instead of PUZZLE_CONFIG -> "theme" -> THEMES
+PUZZLE_TO_THEME: Mapping[str, Theme] = MappingProxyType({
+    puzzle_key: THEMES[cfg["theme"]] for puzzle_key, cfg in PUZZLE_CONFIG.items() if cfg.get("theme") in THEMES
+})
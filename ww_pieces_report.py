@@ -11,30 +11,86 @@ Change from previous version:
 from __future__ import annotations
 import argparse
 import csv
+import heapq
 import json
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Final, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set
 
-# Try to use requests if available; otherwise fall back to urllib
+# Try to use requests if available; otherwise fall back to http.client
 try:
     import requests  # type: ignore
     HAS_REQUESTS = True
 except Exception:
-    import urllib.request as _urllib_request  # type: ignore
+    import http.client as _http_client  # type: ignore
     HAS_REQUESTS = False
 
-def load_data(path: Path) -> Dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+# orjson is optional; it parses large data files much faster than the stdlib json
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# default locations, resolved once per process
+DATA_ROOT: Final = Path.home() / "Alice2.0" / "data"
+DEFAULT_DATA_FILE: Final = DATA_ROOT / "collected_pieces.json"
+DEFAULT_CACHE_FILE: Final = DATA_ROOT / "backups" / "user_lookup_cache.json"
+
+# report output is encoded once per line and written through a 64 KiB buffer
+OUT_BUFFER_SIZE: Final = 1 << 16
+
+# Discord member lookups: worker threads plus a token bucket (burst, requests per second)
+LOOKUP_WORKERS: Final = 8
+LOOKUP_BURST: Final = 5
+LOOKUP_RATE: Final = 4.0
+LOOKUP_ATTEMPTS: Final = 3
+DISCORD_HOST: Final = "discord.com"
+# cached display names older than this are re-fetched from Discord (seconds)
+NAME_CACHE_TTL: Final = 7 * 86400
+
+_NUM_KEYS: Dict[str, tuple] = {}
+
+def _num_key(x: str) -> tuple:
+    # numeric IDs sort by value ahead of any non-numeric ones; parsed once per distinct ID
+    k = _NUM_KEYS.get(x)
+    if k is None:
+        k = _NUM_KEYS[x] = (int(x), "") if x.isdigit() else (float("inf"), x)
+    return k
+
+def _loads(buf: bytes):
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def _finisher_uid(f) -> Optional[str]:
+    # finisher entries are either bare IDs or {"user_id": ...} records; malformed ones yield None
+    v = f.get("user_id") if isinstance(f, dict) else f
+    try:
+        return str(int(v))
+    except (TypeError, ValueError):
+        return None
+
+def load_data(path: Path, pkey: Optional[str] = None) -> Dict:
+    raw = path.read_bytes()
+    # cheap prefilter: a puzzle key that never appears in the file can't have pieces, users or finishers
+    if pkey is not None and pkey.isascii() and json.dumps(pkey).encode("ascii") not in raw:
+        return {}
+    return _loads(raw)
 
 def load_map_file(path: Path) -> Dict[str, str]:
     path = path.expanduser().resolve()
     if not path.exists():
         raise FileNotFoundError(str(path))
-    text = path.read_text(encoding="utf-8")
     try:
-        j = json.loads(text)
+        j = _loads(path.read_bytes())
         return {str(k): str(v) for k, v in j.items()}
     except Exception:
         out = {}
@@ -47,23 +103,87 @@ def load_map_file(path: Path) -> Dict[str, str]:
                     out[str(row[0]).strip()] = row[1].strip()
         return out
 
-def discord_get_member(display_cache: Dict[str, str], token: str, guild_id: str, user_id: str, use_requests: bool) -> Optional[str]:
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent."""
+
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.rate = refill_per_sec
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        # drain the bucket into debt so every worker holds off for `seconds`
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+def _header_seconds(headers, name: str, default: float = 0.0) -> float:
+    try:
+        return max(0.0, float(headers.get(name)))
+    except (TypeError, ValueError):
+        return default
+
+# one keep-alive connection per worker thread for the http.client fallback
+_HTTP_LOCAL = threading.local()
+
+def _fetch_json(path: str, headers: Dict[str, str], use_requests: bool, session=None):
+    """Return (status, response headers, parsed body or None)."""
+    if use_requests:
+        r = (session or requests).get(f"https://{DISCORD_HOST}{path}", headers=headers, timeout=10)
+        return r.status_code, r.headers, (r.json() if r.status_code == 200 else None)
+    conn = getattr(_HTTP_LOCAL, "conn", None)
+    if conn is None:
+        conn = _HTTP_LOCAL.conn = _http_client.HTTPSConnection(DISCORD_HOST, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        body = resp.read()
+    except Exception:
+        conn.close()
+        _HTTP_LOCAL.conn = None
+        raise
+    return resp.status, resp.headers, (_loads(body) if resp.status == 200 else None)
+
+def discord_get_member(display_cache: Dict[str, str], token: str, guild_id: str, user_id: str, use_requests: bool, bucket: Optional[TokenBucket] = None, session=None) -> Optional[str]:
     if user_id in display_cache:
         return display_cache[user_id]
-    url = f"https://discord.com/api/v10/guilds/{guild_id}/members/{user_id}"
+    path = f"/api/v10/guilds/{guild_id}/members/{user_id}"
     headers = {"Authorization": f"Bot {token}", "User-Agent": "ww-pieces-report/1.0"}
     try:
-        if use_requests:
-            r = requests.get(url, headers=headers, timeout=10)
-            if r.status_code == 200:
-                m = r.json()
-            else:
-                return None
-        else:
-            req = _urllib_request.Request(url, headers=headers)
-            with _urllib_request.urlopen(req, timeout=10) as resp:
-                raw = resp.read().decode("utf-8")
-                m = json.loads(raw)
+        m = None
+        for _ in range(LOOKUP_ATTEMPTS):
+            if bucket is not None:
+                bucket.acquire()
+            status, resp_headers, m = _fetch_json(path, headers, use_requests, session)
+            if status == 429:
+                delay = _header_seconds(resp_headers, "Retry-After", 1.0)
+                if bucket is not None:
+                    bucket.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            if bucket is not None and resp_headers.get("X-RateLimit-Remaining") == "0":
+                bucket.pause(_header_seconds(resp_headers, "X-RateLimit-Reset-After"))
+            break
+        if status != 200 or not m:
+            return None
         user = m.get("user", {})
         nick = m.get("nick")
         username = user.get("username") or user.get("id")
@@ -77,133 +197,213 @@ def discord_get_member(display_cache: Dict[str, str], token: str, guild_id: str,
     except Exception:
         return None
 
+def _load_name_cache(cache_file: Path) -> Dict[str, Dict]:
+    """Read the lookup cache as {uid: {"name": str, "ts": unix_ts}}; legacy plain-name entries count as stale."""
+    try:
+        raw = _loads(cache_file.read_bytes()) if cache_file.exists() else {}
+    except Exception:
+        return {}
+    cache: Dict[str, Dict] = {}
+    for uid, entry in raw.items():
+        if isinstance(entry, dict) and "name" in entry:
+            cache[uid] = {"name": entry["name"], "ts": entry.get("ts") or 0}
+        elif isinstance(entry, str):
+            cache[uid] = {"name": entry, "ts": 0}
+    return cache
+
 def resolve_display_names(user_ids: Set[str], map_file: Optional[Path], token: Optional[str], guild_id: Optional[str], cache_file: Optional[Path]) -> Dict[str, str]:
     result: Dict[str, str] = {}
-    cache: Dict[str, str] = {}
-    if cache_file:
-        try:
-            if cache_file.exists():
-                cache = json.loads(cache_file.read_text(encoding="utf-8"))
-        except Exception:
-            cache = {}
+    mf: Dict[str, str] = {}
+    now = time.time()
+    cache = _load_name_cache(cache_file) if cache_file else {}
+    # entries younger than the TTL are trusted; older ones are still shown but re-fetched when a token is given
+    fresh = {uid: e["name"] for uid, e in cache.items() if now - e["ts"] <= NAME_CACHE_TTL}
     if map_file:
         try:
             mf = load_map_file(map_file)
             result.update(mf)
         except Exception as e:
             print(f"[warn] Unable to read map file {map_file}: {e}", file=sys.stderr)
-    for uid, name in cache.items():
+    for uid, entry in cache.items():
         if uid not in result:
-            result[uid] = name
-    remaining = [uid for uid in user_ids if uid not in result]
+            result[uid] = entry["name"]
+    remaining = [uid for uid in user_ids if uid not in mf and uid not in fresh]
     if token and guild_id and remaining:
         use_requests = HAS_REQUESTS
-        for uid in remaining:
-            name = discord_get_member(cache, token, guild_id, uid, use_requests)
-            if name:
-                result[uid] = name
-            time.sleep(0.25)
+        bucket = TokenBucket(LOOKUP_BURST, LOOKUP_RATE)
+        # one session per worker thread (requests.Session isn't thread-safe) keeps its TLS connection
+        # to Discord alive across that worker's lookups; all of them are closed once the pool is done
+        local = threading.local()
+        sessions = []
+
+        def fetch(uid: str) -> Optional[str]:
+            session = getattr(local, "session", None)
+            if use_requests and session is None:
+                session = local.session = requests.Session()
+                sessions.append(session)
+            return discord_get_member(fresh, token, guild_id, uid, use_requests, bucket, session)
+
+        try:
+            with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as pool:
+                for uid, name in zip(remaining, pool.map(fetch, remaining)):
+                    if name:
+                        result[uid] = name
+                        cache[uid] = {"name": name, "ts": now}
+        finally:
+            for session in sessions:
+                session.close()
     if cache_file:
         try:
             merged = dict(cache)
-            merged.update({k: v for k, v in result.items() if k not in merged})
+            merged.update({k: {"name": v, "ts": now} for k, v in result.items() if k not in merged})
             cache_file.parent.mkdir(parents=True, exist_ok=True)
-            cache_file.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+            cache_file.write_bytes(_dumps(merged))
         except Exception:
             pass
     return result
 
-def main():
-    parser = argparse.ArgumentParser(description="Produce puzzle pieces report with optional user id -> display name resolution")
-    parser.add_argument("--data", "-d", default=str(Path.home() / "Alice2.0" / "data" / "collected_pieces.json"))
-    parser.add_argument("--puzzle", "-p", default="winter_wonderland")
-    parser.add_argument("--out", "-o", help="Optional output file path")
-    parser.add_argument("--map-file", "-m", help="Optional local map file (JSON or CSV) mapping user_id -> display name")
-    parser.add_argument("--discord-token", "-t", help="Optional Bot token to resolve member names via Discord API (requires --guild-id)")
-    parser.add_argument("--guild-id", "-g", help="Guild ID for Discord member lookups")
-    parser.add_argument("--cache", "-c", help="Cache file path for Discord lookups (JSON). Default: data/backups/user_lookup_cache.json")
-    args = parser.parse_args()
-
-    data_path = Path(args.data)
-    if not data_path.exists():
-        raise SystemExit(f"Data file not found: {data_path}")
+class PuzzleView(NamedTuple):
+    pkey: str
+    piece_ids: List[str]
+    users: Dict[str, List[str]]
+    finishers: List[str]
 
-    data = load_data(data_path)
-    pkey = args.puzzle
+    @property
+    def user_ids(self) -> Set[str]:
+        return set(self.users) | set(self.finishers)
 
+def collect_puzzle(data: Dict, pkey: str) -> PuzzleView:
+    """Extract one puzzle's piece IDs, holders (uid -> piece IDs) and finishers from the data file."""
     pieces_map = data.get("pieces", {}).get(pkey, {}) or {}
-    all_piece_ids = sorted([str(k) for k in pieces_map.keys()], key=lambda x: int(x) if x.isdigit() else x)
-    total_pieces = len(all_piece_ids)
+    all_piece_ids = sorted(pieces_map, key=_num_key)
 
     user_pieces = data.get("user_pieces", {}) or {}
     users: Dict[str, List[str]] = {}
     for uid_str, puzzles in user_pieces.items():
-        pieces = puzzles.get(pkey, []) if isinstance(puzzles, dict) else []
+        if not isinstance(puzzles, dict):
+            continue
+        pieces = puzzles.get(pkey)
         if pieces:
-            users[uid_str] = [str(x) for x in pieces]
+            users[uid_str] = list(map(str, pieces))
 
     finishers_raw = data.get("puzzle_finishers", {}).get(pkey, []) or []
-    finishers: List[str] = []
-    for f in finishers_raw:
-        try:
-            uid = str(f.get("user_id")) if isinstance(f, dict) else str(f)
-            finishers.append(uid)
-        except Exception:
-            continue
+    finishers = [u for u in map(_finisher_uid, finishers_raw) if u is not None]
+    return PuzzleView(pkey, all_piece_ids, users, finishers)
 
-    user_ids: Set[str] = set(users.keys()) | set(finishers)
-    map_file = Path(args.map_file).expanduser().resolve() if args.map_file else None
-    cache_file = Path(args.cache).expanduser().resolve() if args.cache else Path.home() / "Alice2.0" / "data" / "backups" / "user_lookup_cache.json"
-
-    name_map = resolve_display_names(user_ids, map_file, args.discord_token, args.guild_id, cache_file)
+def build_report(view: PuzzleView, name_map: Dict[str, str], top: Optional[int] = None) -> Iterator[str]:
+    """Yield the report lines for a collected puzzle; name_map maps user IDs to display names."""
+    all_piece_ids, users, finishers = view.piece_ids, view.users, view.finishers
+    order_index = {pid: i for i, pid in enumerate(all_piece_ids)}
+    user_count = {u: len(p) for u, p in users.items()}
+    pretty_cache: Dict[str, str] = {}
 
     def pretty(uid: str) -> str:
-        return f"{name_map.get(uid, '')} <{uid}>" if uid in name_map else f"{uid}"
+        # finishers usually also appear in the user list, so each label is formatted once
+        r = pretty_cache.get(uid)
+        if r is None:
+            r = pretty_cache[uid] = f"{name_map[uid]} <{uid}>" if uid in name_map else uid
+        return r
 
-    out_lines: List[str] = []
-    out_lines.append(f"Puzzle: {pkey}")
-    out_lines.append(f"Total pieces expected: {total_pieces}")
-    out_lines.append("")
-    out_lines.append("Finishers (recorded order):")
+    yield f"Puzzle: {view.pkey}"
+    yield f"Total pieces expected: {len(all_piece_ids)}"
+    yield ""
+    yield "Finishers (recorded order):"
     if finishers:
         for pos, uid in enumerate(finishers, start=1):
-            cnt = len(users.get(uid, []))
-            out_lines.append(f"  {pos}. {pretty(uid)} — recorded pieces: {cnt}")
+            yield f"  {pos}. {pretty(uid)} — recorded pieces: {user_count.get(uid, 0)}"
     else:
-        out_lines.append("  (none)")
-
-    out_lines.append("")
-    out_lines.append("All users with any pieces (sorted by count desc):")
-    sorted_users = sorted(users.items(), key=lambda kv: (-len(kv[1]), int(kv[0]) if kv[0].isdigit() else kv[0]))
-    for uid_str, pieces in sorted_users:
-        uid = uid_str
-        pieces_sorted = sorted([str(x) for x in pieces], key=lambda x: int(x) if x.isdigit() else x)
-        missing = [pid for pid in all_piece_ids if pid not in pieces_sorted]
+        yield "  (none)"
+
+    yield ""
+    # (-count, id key, uid, pieces): ids are unique, so comparisons never reach the lists
+    decorated = [(-user_count[u], _num_key(u), u, p) for u, p in users.items()]
+    if top is not None and top < len(users):
+        yield f"Top {top} users by piece count (of {len(users)} with any pieces):"
+        sorted_users = heapq.nsmallest(top, decorated)
+    else:
+        yield "All users with any pieces (sorted by count desc):"
+        decorated.sort()
+        sorted_users = decorated
+    for _, _, uid, pieces in sorted_users:
+        have = set(pieces)
+        # all_piece_ids is already in display order, so known IDs sort by position alone
+        if have.issubset(order_index):
+            pieces_sorted = sorted(pieces, key=order_index.__getitem__)
+        else:
+            pieces_sorted = sorted(pieces, key=_num_key)
+        missing = [pid for pid in all_piece_ids if pid not in have]
+        yield f"User {pretty(uid)}: count={len(pieces_sorted)}"
         # Show collected piece IDs only (no filenames)
-        collected_display = ", ".join(pieces_sorted)
-        out_lines.append(f"User {pretty(uid)}: count={len(pieces_sorted)}")
-        out_lines.append(f"  collected: {collected_display}")
+        yield f"  collected: {', '.join(pieces_sorted)}"
         if missing:
-            out_lines.append(f"  missing ({len(missing)}): {', '.join(missing)}")
+            yield f"  missing ({len(missing)}): {', '.join(missing)}"
         else:
-            out_lines.append("  missing (0): (complete)")
-        out_lines.append("")
+            yield "  missing (0): (complete)"
+        yield ""
 
-    out_lines.append("Finishers with zero recorded pieces (if any):")
-    zero_finishers = [uid for uid in finishers if len(users.get(uid, [])) == 0]
+    yield "Finishers with zero recorded pieces (if any):"
+    zero_finishers = [uid for uid in finishers if uid not in users]
     if zero_finishers:
         for uid in zero_finishers:
-            out_lines.append(f"  {pretty(uid)}")
+            yield f"  {pretty(uid)}"
     else:
-        out_lines.append("  (none)")
+        yield "  (none)"
 
-    if args.out:
-        outp = Path(args.out).expanduser().resolve()
+def write_report(lines: Iterable[str], out: Optional[str] = None) -> Optional[Path]:
+    """Stream lines to the out file (returned once written) or to stdout when out is None."""
+    if out:
+        outp = Path(out).expanduser().resolve()
         outp.parent.mkdir(parents=True, exist_ok=True)
-        outp.write_text("\n".join(out_lines), encoding="utf-8")
-        print(f"Wrote report to {outp}")
+        fh = outp.open("wb", buffering=OUT_BUFFER_SIZE)
     else:
-        print("\n".join(out_lines))
+        outp = None
+        sys.stdout.flush()
+        fh = sys.stdout.buffer
+    write = fh.write
+    try:
+        for line in lines:
+            write(line.encode("utf-8"))
+            write(b"\n")
+    finally:
+        if outp is not None:
+            fh.close()
+        else:
+            fh.flush()
+    return outp
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Produce puzzle pieces report with optional user id -> display name resolution")
+    parser.add_argument("--data", "-d", default=str(DEFAULT_DATA_FILE))
+    parser.add_argument("--puzzle", "-p", default="winter_wonderland")
+    parser.add_argument("--out", "-o", help="Optional output file path")
+    parser.add_argument("--map-file", "-m", help="Optional local map file (JSON or CSV) mapping user_id -> display name")
+    parser.add_argument("--discord-token", "-t", help="Optional Bot token to resolve member names via Discord API (requires --guild-id)")
+    parser.add_argument("--guild-id", "-g", help="Guild ID for Discord member lookups")
+    parser.add_argument("--top", "-k", type=int, help="Only list the K users with the most pieces")
+    parser.add_argument("--cache", "-c", help="Cache file path for Discord lookups (JSON). Default: data/backups/user_lookup_cache.json")
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 0:
+        parser.error("--top must be zero or positive")
+    return args
+
+def main(argv: Optional[Sequence[str]] = None):
+    args = parse_args(argv)
+
+    data_path = Path(args.data)
+    if not data_path.exists():
+        raise SystemExit(f"Data file not found: {data_path}")
+
+    pkey = args.puzzle
+    view = collect_puzzle(load_data(data_path, pkey), pkey)
+
+    map_file = Path(args.map_file).expanduser().resolve() if args.map_file else None
+    cache_file = Path(args.cache).expanduser().resolve() if args.cache else DEFAULT_CACHE_FILE
+
+    name_map = resolve_display_names(view.user_ids, map_file, args.discord_token, args.guild_id, cache_file)
+
+    outp = write_report(build_report(view, name_map, args.top), args.out)
+    if outp is not None:
+        print(f"Wrote report to {outp}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file